@@ -1,6 +1,7 @@
 from src.executables.executables import Executables
 from src.calculations.cluster import Cluster
 from src.calculations.board import Board
+from src.calculations.symbol import explode_symbol
 from src.config.config import Config
 
 
@@ -56,7 +57,7 @@ class GameCalculations(Executables):
                     ]
 
                     for positions in cluster:
-                        board[positions[0]][positions[1]].explode = True
+                        explode_symbol(board, positions[0], positions[1])
                         if {
                             "reel": positions[0],
                             "row": positions[1],
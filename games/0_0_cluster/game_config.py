@@ -69,6 +69,7 @@ class GameConfig(Config):
         self.paytable = self.convert_range_table(pay_group)
 
         self.include_padding = True
+        self.pool_symbols = True
         self.special_symbols = {"wild": ["W"], "scatter": ["S"]}
 
         self.freespin_triggers = {
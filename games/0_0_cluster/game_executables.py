@@ -30,7 +30,11 @@ class GameExecutables(GameCalculations):
 
     def get_clusters_update_wins(self):
         """Find clusters on board and update win manager."""
-        clusters = Cluster.get_clusters(self.board, "wild")
+        if self.config.incremental_clusters and self.tumbled_positions is not None:
+            clusters = Cluster.update_clusters(self.board, self.clusters, self.tumbled_positions, "wild")
+        else:
+            clusters = Cluster.get_clusters_array(self.get_board_array("wild"))
+        self.clusters = clusters
         return_data = {
             "totalWin": 0,
             "wins": [],
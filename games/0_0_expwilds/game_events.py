@@ -94,8 +94,8 @@ def reveal_prize_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": "superspin",
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
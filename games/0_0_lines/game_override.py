@@ -1,5 +1,6 @@
 from game_executables import GameExecutables
 from src.calculations.statistics import get_random_outcome
+from src.calculations.lines import Lines
 
 
 class GameStateOverride(GameExecutables):
@@ -21,10 +22,21 @@ class GameStateOverride(GameExecutables):
         multiplier_value = 1
         if self.gametype == self.config.freegame_type:
             multiplier_value = get_random_outcome(
-                self.get_current_distribution_conditions()["mult_values"][self.gametype]
+                self.get_current_distribution_conditions()["mult_values"][self.gametype], rng=self.rng
             )
         symbol.assign_attribute({"multiplier": multiplier_value})
 
+    def precheck_repeat(self) -> bool:
+        """Basegame-only criteria are decided by the line wins of the drawn board."""
+        if self.get_current_distribution_conditions()["force_freegame"] or self.check_fs_condition():
+            return False
+        line_win = Lines.get_lines(self.board, self.config, global_multiplier=self.global_multiplier)["totalWin"]
+        final_win = round(min(line_win, self.config.wincap), 2)
+        win_criteria = self.get_current_betmode_distributions().get_win_criteria()
+        if win_criteria is not None:
+            return final_win != win_criteria
+        return final_win == 0
+
     def check_repeat(self):
         super().check_repeat()
         if self.repeat is False:
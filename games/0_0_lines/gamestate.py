@@ -1,4 +1,5 @@
 from game_override import GameStateOverride
+from src.events.events import reveal_event
 
 
 class GameState(GameStateOverride):
@@ -9,7 +10,10 @@ class GameState(GameStateOverride):
         self.repeat = True
         while self.repeat:
             self.reset_book()
-            self.draw_board()
+            self.draw_board(emit_event=False)
+            if self.check_early_repeat():
+                continue
+            reveal_event(self)
 
             # Evaluate wins, update wallet, transmit events
             self.evaluate_lines_board()
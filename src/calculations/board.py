@@ -1,9 +1,10 @@
 """Handles generating game-boards from reelstrips"""
 
-import random
 from typing import List
 from src.state.state import GeneralGameState
 from src.calculations.statistics import get_random_outcome
+from src.calculations.symbol import Symbol
+from src.calculations.board_array import BoardArray
 from src.events.events import reveal_event
 
 
@@ -12,49 +13,14 @@ class Board(GeneralGameState):
 
     def create_board_reelstrips(self) -> None:
         """Randomly selects stopping positions from a reelstrip."""
-        if self.config.include_padding:
-            top_symbols = []
-            bottom_symbols = []
         self.refresh_special_syms()
         self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         self.reelstrip = self.config.reels[self.reelstrip_id]
         anticipation = [0] * self.config.num_reels
-        board = [[]] * self.config.num_reels
-        for i in range(self.config.num_reels):
-            board[i] = [0] * self.config.num_rows[i]
-        reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
-        padding_positions = [0] * self.config.num_reels
-        first_scatter_reel = -1
-        for reel in range(self.config.num_reels):
-            reel_pos = reel_positions[reel]
-            if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-                if sym.defn.special:
-                    for special_symbol in self.special_syms_on_board:
-                        for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
-                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
-                                if (
-                                    board[reel][row].check_attribute("scatter")
-                                    and len(self.special_syms_on_board[special_symbol])
-                                    >= self.config.anticipation_triggers[self.gametype]
-                                    and first_scatter_reel == -1
-                                ):
-                                    first_scatter_reel = reel + 1
-            padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
+        reel_positions = self.rng.randrange_array([len(self.reelstrip[reel]) for reel in range(self.config.num_reels)])
+        board, top_symbols, bottom_symbols, padding_positions, first_scatter_reel = self.fill_board(reel_positions)
 
         if first_scatter_reel > -1 and first_scatter_reel != self.config.num_reels:
             count = 1
@@ -67,6 +33,8 @@ class Board(GeneralGameState):
                 raise RuntimeError
 
         self.board = board
+        self.board_array = None
+        self.tumbled_positions = None
         self.get_special_symbols_on_board()
         self.reel_positions = reel_positions
         self.padding_position = padding_positions
@@ -77,69 +45,100 @@ class Board(GeneralGameState):
 
     def force_board_from_reelstrips(self, reelstrip_id: str, force_stop_positions: List[List]) -> None:
         """Creates a gameboard from specified stopping positions."""
-        if self.config.include_padding:
-            top_symbols = []
-            bottom_symbols = []
         self.refresh_special_syms()
         self.reelstrip_id = reelstrip_id
         self.reelstrip = self.config.reels[self.reelstrip_id]
         anticipation = [0] * self.config.num_reels
-        board = [[]] * self.config.num_reels
-        for i in range(self.config.num_reels):
-            board[i] = [0] * self.config.num_rows[i]
 
         reel_positions = [None] * self.config.num_reels
         for r, s in force_stop_positions.items():
-            reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
+            reel_positions[r] = s - self.rng.randint(0, self.config.num_rows[r] - 1)
         for r, _ in enumerate(reel_positions):
             if reel_positions[r] is None:
-                reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
+                reel_positions[r] = self.rng.randrange(len(self.reelstrip[r]))
+        board, top_symbols, bottom_symbols, padding_positions, first_scatter_reel = self.fill_board(reel_positions)
+
+        if first_scatter_reel > -1 and first_scatter_reel <= self.config.num_reels:
+            count = 1
+            for reel in range(first_scatter_reel, self.config.num_reels):
+                anticipation[reel] = count
+                count += 1
 
+        self.board = board
+        self.board_array = None
+        self.tumbled_positions = None
+        self.reel_positions = reel_positions
+        self.padding_position = padding_positions
+        self.anticipation = anticipation
+        if self.config.include_padding:
+            self.top_symbols = top_symbols
+            self.bottom_symbols = bottom_symbols
+
+    def fill_board(self, reel_positions: List[int]) -> tuple:
+        """Create board (and padding) symbols at the given stop positions of the current reelstrip.
+
+        Symbol names come from the precomputed reelstrip windows. Symbols are created as in create_symbol(),
+        padding first, so special symbol functions draw random values in the same order. Returns
+        (board, top_symbols, bottom_symbols, padding_positions, first_scatter_reel).
+        """
+        symbol_defs = self.symbol_storage.symbol_defs
+        reel_windows = self.config.get_reel_windows(self.reelstrip_id, symbol_defs)
+        include_padding = self.config.include_padding
+        symbol_pool = self.symbol_storage.pool
+        symbol_functions = self.special_symbol_functions
+        special_names = {name for name, defn in symbol_defs.items() if defn.special}.union(symbol_functions)
+        board, top_symbols, bottom_symbols = [], [], []
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
-            reel_pos = reel_positions[reel]
-            if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-
+            windows = reel_windows[reel]
+            window = windows[reel_positions[reel] % len(windows)]
+            names = (window[0], window[-1]) + window[1:-1] if include_padding else window[1:-1]
+            symbols = [symbol_pool.get(name) or Symbol(symbol_defs[name]) for name in names]
+            has_special = not special_names.isdisjoint(names)
+            if has_special:
+                for name, sym in zip(names, symbols):
+                    for func in symbol_functions.get(name, ()):
+                        func(sym)
+            if include_padding:
+                top_symbols.append(symbols[0])
+                bottom_symbols.append(symbols[1])
+                del symbols[:2]
+            board.append(symbols)
+            for row, sym in enumerate(symbols if has_special else ()):
                 if sym.defn.special:
                     for special_symbol in self.special_syms_on_board:
                         for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
+                            if sym.name == s:
                                 self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
                                 if (
-                                    board[reel][row].check_attribute("scatter")
+                                    sym.check_attribute("scatter")
                                     and len(self.special_syms_on_board[special_symbol])
                                     >= self.config.anticipation_triggers[self.gametype]
                                     and first_scatter_reel == -1
                                 ):
                                     first_scatter_reel = reel + 1
-                padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
+            padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(windows)
 
-        if first_scatter_reel > -1 and first_scatter_reel <= self.config.num_reels:
-            count = 1
-            for reel in range(first_scatter_reel, self.config.num_reels):
-                anticipation[reel] = count
-                count += 1
+        return board, top_symbols, bottom_symbols, padding_positions, first_scatter_reel
 
-        self.board = board
-        self.reel_positions = reel_positions
-        self.padding_position = padding_positions
-        self.anticipation = anticipation
-        if self.config.include_padding:
-            self.top_symbols = top_symbols
-            self.bottom_symbols = bottom_symbols
+    def get_board_array(self, wild_key: str = "wild", multiplier_key: str = "multiplier") -> BoardArray:
+        """Integer matrix view of self.board for the NumPy win evaluators.
+
+        The view is built once per board and reset when the board is drawn or tumbled. Call
+        invalidate_board_array() after replacing or modifying board symbols in any other way.
+        """
+        if (
+            self.board_array is None
+            or self.board_array.wild_key != wild_key
+            or self.board_array.multiplier_key != multiplier_key
+        ):
+            self.board_array = BoardArray(self.board, self.symbol_table_index, wild_key, multiplier_key)
+        return self.board_array
+
+    def invalidate_board_array(self) -> None:
+        """Discard the board array view after board symbols have changed."""
+        self.board_array = None
 
     def create_symbol(self, name: str):
         sym = self.symbol_storage.create_symbol(name)
@@ -196,7 +195,9 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["force_freegame"]
             and self.gametype == self.config.basegame_type
         ):
-            num_scatters = get_random_outcome(self.get_current_distribution_conditions()["scatter_triggers"])
+            num_scatters = get_random_outcome(
+                self.get_current_distribution_conditions()["scatter_triggers"], rng=self.rng
+            )
             self.force_special_board(trigger_symbol, num_scatters)
         elif (
             not (self.get_current_distribution_conditions()["force_freegame"])
@@ -244,7 +245,7 @@ class Board(GeneralGameState):
         Helper function for forcing special (or name specific) symbols
         """
         reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
 
@@ -256,8 +257,8 @@ class Board(GeneralGameState):
         possible_probs = [p for p in sym_prob if p > 0]
 
         while len(force_stop_positions) != num_force_syms and len(possible_reels) > 0:
-            chosen_reel = random.choices(possible_reels, possible_probs)[0]
-            chosen_stop = random.choice(reelstops[chosen_reel])
+            chosen_reel = self.rng.choices(possible_reels, possible_probs)[0]
+            chosen_stop = self.rng.choice(reelstops[chosen_reel])
             sym_prob[chosen_reel] = 0
             force_stop_positions[int(chosen_reel)] = int(chosen_stop)
             possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
@@ -316,7 +317,7 @@ class Board(GeneralGameState):
 
         assert len(free_positions) >= additional_count, "not enough free place for additional symbols"
 
-        new_positions = random.choices(free_positions, additional_count)[0]
-        random.shuffle(new_positions)
+        new_positions = self.rng.choices(free_positions, additional_count)[0]
+        self.rng.shuffle(new_positions)
         for np in new_positions:
             self.board[np[0]][np[1]] = self.create_symbol(symbol_name)
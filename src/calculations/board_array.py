@@ -0,0 +1,74 @@
+"""Integer matrix view of a game board, used by the NumPy win evaluators."""
+
+from weakref import WeakKeyDictionary
+import numpy as np
+
+_payline_arrays = WeakKeyDictionary()
+_paytable_matrices = WeakKeyDictionary()
+
+
+class BoardArray:
+    """Symbol ids, wild mask and multiplier values of a board of Symbol objects, indexed [reel, row].
+
+    symbol_ids index symbol_names, cells past the end of shorter reels hold -1. wild is True where the symbol
+    has the wild_key attribute, multiplier holds the multiplier_key attribute value and 0 for symbols without one.
+    Multipliers are expected to be integers (or all floats) so that evaluator outputs keep their Python types.
+    """
+
+    def __init__(self, board: list, symbol_index: dict, wild_key: str = "wild", multiplier_key: str = "multiplier"):
+        self.symbol_names = list(symbol_index)
+        self.wild_key = wild_key
+        self.multiplier_key = multiplier_key
+        num_rows = max(len(reel) for reel in board)
+        ids = [[symbol_index[sym.name] for sym in symbols] + [-1] * (num_rows - len(symbols)) for symbols in board]
+        wilds = [[False] * num_rows for _ in board]
+        multipliers = [[0] * num_rows for _ in board]
+        for reel, symbols in enumerate(board):
+            for row, sym in enumerate(symbols):
+                if sym.shared:
+                    continue  # pooled symbols only hold default non-special attributes
+                if sym.check_attribute(wild_key):
+                    wilds[reel][row] = True
+                if sym.check_attribute(multiplier_key) and sym.get_attribute(multiplier_key):
+                    multipliers[reel][row] = sym.get_attribute(multiplier_key)
+        self.symbol_ids = np.array(ids, dtype=np.int32)
+        self.wild = np.array(wilds, dtype=bool)
+        self.multiplier = np.array(multipliers)
+
+    def name_mask(self, names) -> np.ndarray:
+        """True where the board symbol name is one of names."""
+        ids = [self.symbol_names.index(name) for name in names if name in self.symbol_names]
+        return np.isin(self.symbol_ids, ids)
+
+
+def get_payline_array(config) -> np.ndarray:
+    """config.paylines as an (num_lines, num_reels) array of rows, in config.paylines order.
+
+    Built again whenever config.paylines is replaced by another object.
+    """
+    cached = _payline_arrays.get(config)
+    if cached is None or cached[0] is not config.paylines:
+        array = np.array(list(config.paylines.values()), dtype=np.intp)
+        cached = _payline_arrays[config] = (config.paylines, array)
+    return cached[1]
+
+
+def get_paytable_matrix(config, symbol_names: list) -> np.ndarray:
+    """config.paytable as a dense [symbol_id, kind] matrix, 0 where there is no payout.
+
+    Built again whenever config.paytable is replaced by another object.
+    """
+    key = tuple(symbol_names)
+    cached = _paytable_matrices.get(config)
+    if cached is None or cached[0] is not config.paytable:
+        cached = _paytable_matrices[config] = (config.paytable, {})
+    matrices = cached[1]
+    if key not in matrices:
+        max_kind = max((kind for kind, _ in config.paytable), default=0)
+        matrix = np.zeros((len(symbol_names), max_kind + 1))
+        symbol_ids = {name: index for index, name in enumerate(symbol_names)}
+        for (kind, name), payout in config.paytable.items():
+            if name in symbol_ids:
+                matrix[symbol_ids[name], kind] = payout
+        matrices[key] = matrix
+    return matrices[key]
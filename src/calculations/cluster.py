@@ -2,10 +2,13 @@ from collections import defaultdict
 from abc import ABC
 from typing import List, Dict
 from src.calculations.board import Board
-from src.calculations.symbol import Symbol
+from src.calculations.symbol import Symbol, explode_symbol
+from src.calculations.board_array import BoardArray
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 
+_cell_neighbours = {}
+
 
 class Cluster:
     """Collection of cluster-evaluation functions."""
@@ -53,59 +56,118 @@ class Cluster:
             return True
 
     @staticmethod
-    def check_all_neighbours(
-        board: Board,
-        already_checked: list,
-        local_checked: list,
-        potential_cluster: list,
-        reel,
-        row,
-        og_symbol: str,
-        wild_key: str = "wild",
-    ):
-        """Recursively check neighbours for like-symbols."""
-        neighbours = Cluster.get_neighbours(board, reel, row, local_checked)
-        for reel_, row_ in neighbours:
-            if Cluster.in_cluster(board, reel_, row_, og_symbol, wild_key):
-                potential_cluster += [(reel_, row_)]
-                already_checked += [(reel_, row_)]
-                Cluster.check_all_neighbours(
-                    board,
-                    already_checked,
-                    local_checked,
-                    potential_cluster,
-                    reel_,
-                    row_,
-                    og_symbol,
-                    wild_key,
-                )
+    def get_cell_neighbours(num_rows: tuple) -> tuple:
+        """Positions and indices of flat board cells, and their neighbour cells (left, right, above, below)."""
+        if num_rows not in _cell_neighbours:
+            offsets = [sum(num_rows[:reel]) for reel in range(len(num_rows))]
+            positions = [(reel, row) for reel, rows in enumerate(num_rows) for row in range(rows)]
+            neighbours = []
+            for reel, row in positions:
+                cells = []
+                for reel_, row_ in ((reel - 1, row), (reel + 1, row), (reel, row - 1), (reel, row + 1)):
+                    if 0 <= reel_ < len(num_rows) and 0 <= row_ < num_rows[reel_]:
+                        cells.append(offsets[reel_] + row_)
+                neighbours.append(tuple(cells))
+            cells = {position: cell for cell, position in enumerate(positions)}
+            _cell_neighbours[num_rows] = (positions, cells, neighbours)
+        return _cell_neighbours[num_rows]
 
     @staticmethod
-    def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
-        """Return all symbol clusters of size >= 1."""
-        already_checked = []
+    def find_clusters(names: list, wilds: list, num_rows: tuple, already_checked: bytearray = None) -> dict:
+        """Iterative flood fill over flat board cells, returning {name: [[(reel, row), ...], ...]}.
+
+        names and wilds are given per cell, reel by reel. Cells are visited depth first in the same order as a
+        recursive neighbour search, so cluster positions keep their order. Wilds join every cluster they touch.
+        Cells set in already_checked are not used to start a cluster.
+        """
+        positions, _, neighbours = Cluster.get_cell_neighbours(num_rows)
+        if already_checked is None:
+            already_checked = bytearray(len(names))
         clusters = defaultdict(list)
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                if (reel, row) not in already_checked and not (board[reel][row].check_attribute(wild_key)):
-                    potential_cluster = [(reel, row)]
-                    already_checked += [(reel, row)]
-                    local_checked = [(reel, row)]
-                    symbol = board[reel][row].name
-                    Cluster.check_all_neighbours(
-                        board,
-                        already_checked,
-                        local_checked,
-                        potential_cluster,
-                        reel,
-                        row,
-                        symbol,
-                        wild_key,
-                    )
-                    clusters[symbol].append(potential_cluster)
+        local_checked = [-1] * len(names)  # start cell of the last search that reached each cell
+        for start, symbol in enumerate(names):
+            if already_checked[start] or wilds[start]:
+                continue
+            start_neighbours = neighbours[start]
+            if not any(wilds[cell] or names[cell] == symbol for cell in start_neighbours):
+                already_checked[start] = 1
+                clusters[symbol].append([positions[start]])
+                continue
+            local_checked[start] = start
+            for cell in start_neighbours:
+                local_checked[cell] = start
+            potential_cluster = [start]
+            stack = [iter(start_neighbours)]
+            while stack:
+                for cell in stack[-1]:
+                    if wilds[cell] or names[cell] == symbol:
+                        potential_cluster.append(cell)
+                        unchecked = [n for n in neighbours[cell] if local_checked[n] != start]
+                        for n in unchecked:
+                            local_checked[n] = start
+                        stack.append(iter(unchecked))
+                        break
+                else:
+                    stack.pop()
+            for cell in potential_cluster:
+                already_checked[cell] = 1
+            clusters[symbol].append([positions[cell] for cell in potential_cluster])
 
         return clusters
 
+    @staticmethod
+    def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
+        """Return all symbol clusters of size >= 1."""
+        names = [sym.name for reel in board for sym in reel]
+        wilds = [sym.check_attribute(wild_key) for reel in board for sym in reel]
+        return Cluster.find_clusters(names, wilds, tuple(len(reel) for reel in board))
+
+    @staticmethod
+    def get_clusters_array(board_array: BoardArray) -> dict:
+        """get_clusters() evaluated on a BoardArray, the wild key is taken from the board array."""
+        names, wilds, num_rows = [], [], []
+        for reel_ids, reel_wilds in zip(board_array.symbol_ids.tolist(), board_array.wild.tolist()):
+            rows = len(reel_ids) - reel_ids.count(-1)
+            names += [board_array.symbol_names[symbol_id] for symbol_id in reel_ids[:rows]]
+            wilds += reel_wilds[:rows]
+            num_rows.append(rows)
+        return Cluster.find_clusters(names, wilds, tuple(num_rows))
+
+    @staticmethod
+    def update_clusters(
+        board: list[list[Symbol]], clusters: dict, changed_positions: list, wild_key: str = "wild"
+    ) -> dict:
+        """get_clusters() of a board where only the symbols at changed_positions differ from the board of clusters.
+
+        Clusters whose cells and neighbours are all unchanged would be found again by the same search, so they are
+        kept. The rest of the board is searched again and clusters are returned in the order of get_clusters().
+        """
+        num_rows = tuple(len(reel) for reel in board)
+        positions, cells, neighbours = Cluster.get_cell_neighbours(num_rows)
+        affected = set(changed_positions)
+        for position in changed_positions:
+            affected.update(positions[cell] for cell in neighbours[cells[position]])
+        already_checked = bytearray(len(cells))
+        kept = []
+        for symbol, symbol_clusters in clusters.items():
+            for cluster in symbol_clusters:
+                if affected.isdisjoint(cluster):
+                    for position in cluster:
+                        already_checked[cells[position]] = 1
+                    kept.append((cells[cluster[0]], symbol, list(cluster)))
+
+        names = [sym.name for reel in board for sym in reel]
+        wilds = [sym.check_attribute(wild_key) for reel in board for sym in reel]
+        found = Cluster.find_clusters(names, wilds, num_rows, already_checked)
+        if not kept:
+            return found
+        for symbol, symbol_clusters in found.items():
+            kept += [(cells[cluster[0]], symbol, cluster) for cluster in symbol_clusters]
+        updated = defaultdict(list)
+        for _, symbol, cluster in sorted(kept, key=lambda start: start[0]):
+            updated[symbol].append(cluster)
+        return updated
+
     @staticmethod
     def evaluate_clusters(
         config: Config,
@@ -150,7 +212,7 @@ class Cluster:
                     ]
 
                     for positions in cluster:
-                        board[positions[0]][positions[1]].explode = True
+                        explode_symbol(board, positions[0], positions[1])
                         if {
                             "reel": positions[0],
                             "row": positions[1],
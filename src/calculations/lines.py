@@ -1,6 +1,9 @@
 """Evaluates and records winds for lines games."""
 
+from weakref import WeakKeyDictionary
+import numpy as np
 from src.calculations.symbol import Symbol
+from src.calculations.board_array import BoardArray, get_payline_array, get_paytable_matrix
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 from src.events.events import (
@@ -9,6 +12,8 @@ from src.events.events import (
     set_total_event,
 )
 
+_compiled_lines = WeakKeyDictionary()
+
 
 class Lines:
     """Collection of functions to handle line-win games."""
@@ -24,6 +29,64 @@ class Lines:
             "meta": meta_data,
         }
 
+    @staticmethod
+    def get_line_win(
+        board: list[list[Symbol]],
+        line_index: int,
+        line: list,
+        symbol: str,
+        kind: int,
+        win: float,
+        multiplier_method: str,
+        global_multiplier: int,
+    ) -> dict:
+        """Apply multipliers to a winning line and construct its line-win event key."""
+        positions = [{"reel": idx, "row": line[idx]} for idx in range(0, kind)]
+        line_win, applied_mult = apply_mult(
+            board,
+            multiplier_method,
+            global_multiplier=global_multiplier,
+            win_amount=win,
+            positions=positions,
+        )
+        return Lines.line_win_info(
+            symbol,
+            kind,
+            line_win,
+            positions,
+            {
+                "lineIndex": line_index,
+                "multiplier": applied_mult,
+                "winWithoutMult": win,
+                "globalMult": int(global_multiplier),
+                "lineMultiplier": int(applied_mult / global_multiplier),
+            },
+        )
+
+    @staticmethod
+    def get_compiled_lines(config: Config) -> tuple:
+        """config.paylines as (line indices, row tuples) and config.paytable as dense payout rows [kind] per symbol.
+
+        Compiled on first use for each config, and again whenever config.paytable or config.paylines is replaced by
+        another object. Also returns the smallest paying kind.
+        """
+        cached = _compiled_lines.get(config)
+        if cached is None or cached[0] is not config.paytable or cached[1] is not config.paylines:
+            max_kind = max([kind for kind, _ in config.paytable] + [len(line) for line in config.paylines.values()])
+            pay_rows = {}
+            for (kind, name), payout in config.paytable.items():
+                pay_rows.setdefault(name, [0] * (max_kind + 1))[kind] = payout
+            min_kind = min((kind for (kind, _), payout in config.paytable.items() if payout > 0), default=0)
+            compiled = (
+                list(config.paylines),
+                [tuple(line) for line in config.paylines.values()],
+                pay_rows,
+                [0] * (max_kind + 1),
+                min_kind,
+            )
+            cached = _compiled_lines[config] = (config.paytable, config.paylines, compiled)
+        return cached[2]
+
     @staticmethod
     def get_lines(
         board: list[list[Symbol]],
@@ -38,93 +101,209 @@ class Lines:
             "totalWin": 0,
             "wins": [],
         }
+        line_indices, lines, pay_rows, no_pays, min_kind = Lines.get_compiled_lines(config)
+        names = [[sym.name for sym in reel] for reel in board]
+        wilds = [[sym.check_attribute(wild_key) for sym in reel] for reel in board]
+        wild_pays = pay_rows.get(wild_sym, no_pays)
 
-        for line_index in config.paylines.keys():
-            line = config.paylines[line_index]
-            first_sym = board[0][line[0]]
-            finished_wild_win = False if first_sym.check_attribute(wild_key) else True
-            first_non_wild = first_sym if finished_wild_win else None
-            potential_line = [first_sym]
-
-            wild_matches = 0 * (finished_wild_win) + 1 * (not (finished_wild_win))
-            matches = 1 * (finished_wild_win) + 0 * (not (finished_wild_win))
-            base_win, wild_win = 0, 0
+        for line_index, line in zip(line_indices, lines):
+            first_name = names[0][line[0]]
+            finished_wild_win = not wilds[0][line[0]]
+            # without 1-kind pays, lines starting with two different symbols cannot win
+            if finished_wild_win and min_kind > 1 and not wilds[1][line[1]] and names[1][line[1]] != first_name:
+                continue
+            first_non_wild = first_name if finished_wild_win else None
+            wild_matches = 0 if finished_wild_win else 1
+            matches = 1 if finished_wild_win else 0
 
             for reel in range(1, len(line)):
-                sym = board[reel][line[reel]]
+                name = names[reel][line[reel]]
                 if finished_wild_win:
-                    if sym.name == first_non_wild.name or sym.check_attribute(wild_key):
+                    if name == first_non_wild or wilds[reel][line[reel]]:
                         matches += 1
                     else:
                         break
+                elif wilds[reel][line[reel]]:
+                    wild_matches += 1
                 else:
-                    if sym.check_attribute(wild_key) and first_non_wild is None:
-                        wild_matches += 1
-                    elif first_non_wild is None:
-                        first_non_wild = sym
-                        matches += 1
-                        finished_wild_win = True
-                    else:
-                        break
-                potential_line.append(sym)
+                    first_non_wild = name
+                    matches += 1
+                    finished_wild_win = True
 
-            if (wild_matches, wild_sym) in config.paytable:
-                wild_win = config.paytable[(wild_matches, wild_sym)]
+            wild_win = wild_pays[wild_matches]
+            base_win = 0
             if first_non_wild is not None:
-                if (wild_matches + matches, first_non_wild.name) in config.paytable:
-                    base_win = config.paytable[(wild_matches + matches, first_non_wild.name)]
+                base_win = pay_rows.get(first_non_wild, no_pays)[wild_matches + matches]
 
             if base_win > 0 or wild_win > 0:
                 if wild_win > base_win:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, wild_matches)]
-                    line_win, applied_mult = apply_mult(
+                    win_dict = Lines.get_line_win(
                         board,
-                        multiplier_method,
-                        global_multiplier=global_multiplier,
-                        win_amount=wild_win,
-                        positions=positions,
-                    )
-                    win_dict = Lines.line_win_info(
-                        potential_line[0].name,
+                        line_index,
+                        line,
+                        first_name,
                         wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": wild_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
+                        wild_win,
+                        multiplier_method,
+                        global_multiplier,
                     )
                 else:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, matches + wild_matches)]
-                    line_win, applied_mult = apply_mult(
+                    win_dict = Lines.get_line_win(
                         board,
-                        multiplier_method,
-                        global_multiplier=global_multiplier,
-                        win_amount=base_win,
-                        positions=positions,
-                    )
-                    win_dict = Lines.line_win_info(
-                        first_non_wild.name,
+                        line_index,
+                        line,
+                        first_non_wild,
                         matches + wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": base_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
+                        base_win,
+                        multiplier_method,
+                        global_multiplier,
                     )
 
-                return_data["totalWin"] += line_win
+                return_data["totalWin"] += win_dict["win"]
                 return_data["wins"].append(win_dict)
 
         return return_data
 
+    @staticmethod
+    def get_lines_array(
+        board: list[list[Symbol]],
+        board_array: BoardArray,
+        config: Config,
+        wild_sym: str = "W",
+        multiplier_method: str = "symbol",
+        global_multiplier: int = 1,
+    ):
+        """get_lines() evaluated on a BoardArray, the wild key is taken from the board array.
+
+        Matching line lengths are found for all paylines at once, win details are only built for paying lines.
+        """
+        return_data = {
+            "totalWin": 0,
+            "wins": [],
+        }
+        paylines = get_payline_array(config)
+        num_lines, num_reels = paylines.shape
+        reels = np.arange(num_reels)
+        line_ids = board_array.symbol_ids[reels, paylines]
+        wild_matches, first_non_wild, kind = Lines.get_line_matches(line_ids, board_array.wild[reels, paylines])
+        base_pays, wild_pays = Lines.get_line_pays(
+            config, board_array.symbol_names, wild_sym, wild_matches, first_non_wild, kind
+        )
+
+        line_keys = list(config.paylines)
+        for line_number in np.flatnonzero((base_pays > 0) | (wild_pays > 0)).tolist():
+            line_index = line_keys[line_number]
+            line = config.paylines[line_index]
+            wild_count = int(wild_matches[line_number])
+            wild_win = config.paytable.get((wild_count, wild_sym), 0)
+            base_win = 0
+            if wild_count < num_reels:
+                symbol = board_array.symbol_names[first_non_wild[line_number]]
+                base_win = config.paytable.get((int(kind[line_number]), symbol), 0)
+            if wild_win > base_win:
+                symbol = board_array.symbol_names[line_ids[line_number, 0]]
+                win_dict = Lines.get_line_win(
+                    board, line_index, line, symbol, wild_count, wild_win, multiplier_method, global_multiplier
+                )
+            else:
+                win_dict = Lines.get_line_win(
+                    board,
+                    line_index,
+                    line,
+                    symbol,
+                    int(kind[line_number]),
+                    base_win,
+                    multiplier_method,
+                    global_multiplier,
+                )
+
+            return_data["totalWin"] += win_dict["win"]
+            return_data["wins"].append(win_dict)
+
+        return return_data
+
+    @staticmethod
+    def get_line_matches(line_ids: np.ndarray, line_wild: np.ndarray) -> tuple:
+        """Leading wild count, first non-wild symbol id and matching length of symbol id lines [..., reel]."""
+        num_reels = line_ids.shape[-1]
+        wild_matches = np.where(line_wild.all(axis=-1), num_reels, np.argmin(line_wild, axis=-1))
+        first_non_wild = np.take_along_axis(line_ids, np.minimum(wild_matches, num_reels - 1)[..., None], axis=-1)
+        no_match = ~(line_wild | (line_ids == first_non_wild))
+        kind = np.where(no_match.any(axis=-1), np.argmax(no_match, axis=-1), num_reels)
+        return wild_matches, first_non_wild[..., 0], kind
+
+    @staticmethod
+    def get_line_pays(
+        config: Config,
+        symbol_names: list,
+        wild_sym: str,
+        wild_matches: np.ndarray,
+        first_non_wild: np.ndarray,
+        kind: np.ndarray,
+    ) -> tuple:
+        """Paytable values of the base symbol and leading wild combinations found by get_line_matches()."""
+        num_reels = get_payline_array(config).shape[1]
+        paytable = get_paytable_matrix(config, symbol_names)
+        max_kind = paytable.shape[1] - 1
+        base_pays = np.where(
+            (wild_matches < num_reels) & (kind <= max_kind), paytable[first_non_wild, np.minimum(kind, max_kind)], 0
+        )
+        wild_pays = np.array([config.paytable.get((k, wild_sym), 0) for k in range(num_reels + 1)])[wild_matches]
+        return base_pays, wild_pays
+
+    @staticmethod
+    def get_lines_batch(
+        symbol_ids: np.ndarray,
+        config: Config,
+        symbol_names: list,
+        wild_key: str = "wild",
+        wild_sym: str = "W",
+        multipliers: np.ndarray = None,
+        multiplier_method: str = "symbol",
+        global_multiplier=1,
+    ) -> dict:
+        """Line wins of N boards of symbol ids [board, reel, row] in one call, without win details or events.
+
+        symbol_ids index symbol_names, wilds are the config.special_symbols[wild_key] names. multipliers holds symbol
+        multiplier values with the shape of symbol_ids (0 or 1 for none), global_multiplier is a number or one value
+        per board. Returns per board "totalWin" and per board and payline "wins", "symbols" and "kinds", in
+        config.paylines order. Lines without a win have symbol -1 and kind 0.
+        """
+        assert multiplier_method in ["symbol", "global", "combined"]
+        paylines = get_payline_array(config)
+        reels = np.arange(paylines.shape[1])
+        line_ids = symbol_ids[:, reels, paylines]
+        wild_ids = [symbol_names.index(name) for name in config.special_symbols[wild_key] if name in symbol_names]
+        line_wild = np.isin(line_ids, wild_ids)
+
+        wild_matches, first_non_wild, kind = Lines.get_line_matches(line_ids, line_wild)
+        base_pays, wild_pays = Lines.get_line_pays(config, symbol_names, wild_sym, wild_matches, first_non_wild, kind)
+        use_wild = wild_pays > base_pays
+        pays = np.where(use_wild, wild_pays, base_pays)
+        kinds = np.where(pays > 0, np.where(use_wild, wild_matches, kind), 0)
+        symbols = np.where(pays > 0, np.where(use_wild, line_ids[..., 0], first_non_wild), -1)
+
+        symbol_mult = 1
+        if multipliers is not None and multiplier_method in ["symbol", "combined"]:
+            line_mults = multipliers[:, reels, paylines]
+            in_win = reels < kinds[..., None]
+            symbol_mult = np.maximum(np.where(in_win & (line_mults > 1), line_mults, 0).sum(axis=-1), 1)
+        global_multiplier = np.reshape(global_multiplier, (-1, 1))
+        match multiplier_method:
+            case "symbol":
+                wins = np.round(pays * symbol_mult, 2)
+            case "global":
+                wins = np.round(pays * global_multiplier, 2)
+            case "combined":
+                wins = np.round(pays * symbol_mult, 2) * global_multiplier
+
+        return {
+            "totalWin": wins.sum(axis=1),
+            "wins": wins,
+            "symbols": symbols,
+            "kinds": kinds,
+        }
+
     @staticmethod
     def emit_linewin_events(gamestate) -> None:
         """Transmit win events asociated with lines wins."""
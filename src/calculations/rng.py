@@ -0,0 +1,118 @@
+"""Random number generators used by gamestates to draw simulation outcomes."""
+
+import random
+import numpy as np
+
+
+class PythonRng:
+    """Random draws from an instance-local random.Random, seeded per simulation."""
+
+    name = "python"
+
+    def __init__(self):
+        self.generator = random.Random()
+
+    def seed(self, seed: int) -> None:
+        """Reset the generator state."""
+        self.generator.seed(seed)
+
+    def uniform(self, a: float, b: float) -> float:
+        """Float in [a, b]."""
+        return self.generator.uniform(a, b)
+
+    def randrange(self, stop: int) -> int:
+        """Integer in [0, stop)."""
+        return self.generator.randrange(stop)
+
+    def randint(self, a: int, b: int) -> int:
+        """Integer in [a, b]."""
+        return self.generator.randint(a, b)
+
+    def choice(self, seq):
+        """One element of a non-empty sequence."""
+        return self.generator.choice(seq)
+
+    def choices(self, population, weights=None, k: int = 1) -> list:
+        """k elements drawn with replacement, with optional relative weights."""
+        return self.generator.choices(population, weights, k=k)
+
+    def shuffle(self, x: list) -> None:
+        """Shuffle a list in place."""
+        self.generator.shuffle(x)
+
+    def randrange_array(self, stops: list) -> list:
+        """One integer in [0, stop) per stop, e.g. reel stop positions for all reels of a spin."""
+        randrange = self.generator.randrange
+        return [randrange(stop) for stop in stops]
+
+
+class GlobalRng(PythonRng):
+    """Random draws from the shared random module, reproducing draws of code calling random.* directly."""
+
+    name = "global"
+
+    def __init__(self):
+        pass
+
+    @property
+    def generator(self):
+        """The random module, resolved on use so gamestates stay picklable."""
+        return random
+
+
+class NumpyRng(PythonRng):
+    """Random draws from a NumPy PCG64 Generator, stop positions for all reels are drawn in one call."""
+
+    name = "numpy"
+
+    def __init__(self):
+        self.generator = np.random.default_rng()
+
+    def seed(self, seed: int) -> None:
+        """Reset the generator state."""
+        self.generator = np.random.default_rng(seed)
+
+    def uniform(self, a: float, b: float) -> float:
+        """Float in [a, b)."""
+        return float(self.generator.uniform(a, b))
+
+    def randrange(self, stop: int) -> int:
+        """Integer in [0, stop)."""
+        return int(self.generator.integers(stop))
+
+    def randint(self, a: int, b: int) -> int:
+        """Integer in [a, b]."""
+        return int(self.generator.integers(a, b, endpoint=True))
+
+    def choice(self, seq):
+        """One element of a non-empty sequence."""
+        return seq[self.randrange(len(seq))]
+
+    def choices(self, population, weights=None, k: int = 1) -> list:
+        """k elements drawn with replacement, with optional relative weights."""
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+            weights = weights / weights.sum()
+        indices = self.generator.choice(len(population), size=k, p=weights)
+        return [population[index] for index in indices.tolist()]
+
+    def shuffle(self, x: list) -> None:
+        """Shuffle a list in place."""
+        self.generator.shuffle(x)
+
+    def randrange_array(self, stops: list) -> list:
+        """One integer in [0, stop) per stop, e.g. reel stop positions for all reels of a spin."""
+        return self.generator.integers(0, stops).tolist()
+
+
+RNG_BACKENDS = {
+    GlobalRng.name: GlobalRng,
+    PythonRng.name: PythonRng,
+    NumpyRng.name: NumpyRng,
+}
+
+
+def make_rng(backend: str = "global") -> PythonRng:
+    """Create the random number generator of a config.rng_backend name."""
+    assert backend in RNG_BACKENDS, f"rng_backend must be one of {list(RNG_BACKENDS)}"
+    return RNG_BACKENDS[backend]()
@@ -2,8 +2,10 @@
 
 from typing import List, Dict
 from collections import defaultdict
+import numpy as np
 from src.config.config import Config
-from src.calculations.symbol import Symbol
+from src.calculations.symbol import Symbol, explode_symbol
+from src.calculations.board_array import BoardArray
 
 
 class Scatter:
@@ -31,6 +33,43 @@ class Scatter:
 
         return (reel_to_overlay, row_to_overlay)
 
+    @staticmethod
+    def get_scatter_win(
+        config: Config,
+        board: list[list[Symbol]],
+        sym: str,
+        positions: List[Dict],
+        rows_for_overlay: List,
+        multiplier_key: str,
+        global_multiplier: int,
+    ) -> dict:
+        """Win data for a paying symbol, marking its positions (including wilds) to explode."""
+        symbol_mult = 0
+        for p in positions:
+            if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
+                symbol_mult += board[p["reel"]][p["row"]].get_attribute(multiplier_key)
+
+            explode_symbol(board, p["reel"], p["row"])
+
+        symbol_mult = max(symbol_mult, 1)
+        overlay_position = Scatter.get_central_scatter_position(rows_for_overlay, positions, len(board), len(board[0]))
+        rows_for_overlay.append(overlay_position[1])
+        win_size = len(positions)
+        return {
+            "symbol": sym,
+            "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
+            "positions": positions,
+            "meta": {
+                "globalMult": global_multiplier,
+                "clusterMult": symbol_mult,
+                "winWithoutMult": config.paytable[(win_size, sym)],
+                "overlay": {
+                    "reel": overlay_position[0],
+                    "row": overlay_position[1],
+                },
+            },
+        }
+
     @staticmethod
     def get_scatterpay_wins(
         config: Config,
@@ -61,32 +100,49 @@ class Scatter:
                 symbols_on_board[sym].extend(wild_positions)
             win_size = len(symbols_on_board[sym])
             if (win_size, sym) in config.paytable:
-                symbol_mult = 0
-                for p in symbols_on_board[sym]:
-                    if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
-                        symbol_mult += board[p["reel"]][p["row"]].get_attribute(multiplier_key)
+                symbol_win_data = Scatter.get_scatter_win(
+                    config, board, sym, symbols_on_board[sym], rows_for_overlay, multiplier_key, global_multiplier
+                )
+                total_win += symbol_win_data["win"]
+                return_data["wins"].append(symbol_win_data)
 
-                    board[p["reel"]][p["row"]].explode = True
+        return_data["totalWin"] = total_win
 
-                symbol_mult = max(symbol_mult, 1)
-                overlay_position = Scatter.get_central_scatter_position(
-                    rows_for_overlay, symbols_on_board[sym], len(board), len(board[0])
+        return return_data
+
+    @staticmethod
+    def get_scatterpay_wins_array(
+        config: Config,
+        board: list[list[Symbol]],
+        board_array: BoardArray,
+        wild_key: str = "wild",
+        multiplier_key: str = "multiplier",
+        global_multiplier: int = 1,
+    ) -> dict:
+        """get_scatterpay_wins() evaluated on a BoardArray, positions are only built for paying symbols."""
+        return_data = {
+            "totalWin": 0,
+            "wins": [],
+        }
+        rows_for_overlay = []
+        total_win = 0.0
+        symbol_ids = board_array.symbol_ids.ravel()
+        wilds = board_array.name_mask(config.special_symbols[wild_key]).ravel()
+        num_rows = board_array.symbol_ids.shape[1]
+        wild_positions = [{"reel": i // num_rows, "row": i % num_rows} for i in np.flatnonzero(wilds).tolist()]
+        counted = (symbol_ids >= 0) & ~wilds
+        counts = np.bincount(symbol_ids[counted], minlength=len(board_array.symbol_names)) + len(wild_positions)
+
+        for symbol_id in dict.fromkeys(symbol_ids[counted].tolist()):
+            sym = board_array.symbol_names[symbol_id]
+            if (int(counts[symbol_id]), sym) in config.paytable:
+                positions = [
+                    {"reel": i // num_rows, "row": i % num_rows}
+                    for i in np.flatnonzero(symbol_ids == symbol_id).tolist()
+                ]
+                symbol_win_data = Scatter.get_scatter_win(
+                    config, board, sym, positions + wild_positions, rows_for_overlay, multiplier_key, global_multiplier
                 )
-                rows_for_overlay.append(overlay_position[1])
-                symbol_win_data = {
-                    "symbol": sym,
-                    "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
-                    "positions": symbols_on_board[sym],
-                    "meta": {
-                        "globalMult": global_multiplier,
-                        "clusterMult": symbol_mult,
-                        "winWithoutMult": config.paytable[(win_size, sym)],
-                        "overlay": {
-                            "reel": overlay_position[0],
-                            "row": overlay_position[1],
-                        },
-                    },
-                }
                 total_win += symbol_win_data["win"]
                 return_data["wins"].append(symbol_win_data)
 
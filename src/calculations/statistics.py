@@ -1,13 +1,85 @@
 import random
+from bisect import bisect_left
 from typing import Union
 
 
-def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
+class WeightedSampler:
+    """Cumulative weights of a {value: weight} distribution, sampled by bisection.
+
+    Each draw consumes one random.uniform(0, total weight) call and returns the first value whose cumulative
+    weight reaches the roll. This is the same random stream and outcome as the linear scan in get_random_outcome().
+    """
+
+    def __init__(self, distribution: dict):
+        self.values = list(distribution)
+        self.cumulative = []
+        cumulative = 0.0
+        for weight in distribution.values():
+            cumulative += weight
+            self.cumulative.append(cumulative)
+        self.total_weight = sum(distribution.values())
+
+    def sample(self, total_weight: float = None, rng=random) -> Union[float, int]:
+        """Draw a value with rng.uniform(), total_weight defaults to the sum of weights."""
+        roll = rng.uniform(0, self.total_weight if total_weight is None else total_weight)
+        index = bisect_left(self.cumulative, roll)
+        if index == len(self.values):
+            return Exception("error drawing item from distribution")
+        return self.values[index]
+
+
+class WeightTable(dict):
+    """{value: weight} dict caching its WeightedSampler, the sampler is rebuilt after the dict is modified."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sampler = None
+
+    def get_sampler(self) -> WeightedSampler:
+        """Sampler of the current weights."""
+        if self._sampler is None:
+            self._sampler = WeightedSampler(self)
+        return self._sampler
+
+
+def _invalidate_sampler(name: str):
+    """dict method that also drops the cached sampler."""
+    method = getattr(dict, name)
+
+    def modify(self, *args, **kwargs):
+        self._sampler = None
+        return method(self, *args, **kwargs)
+
+    modify.__name__ = name
+    return modify
+
+
+for _name in ("__setitem__", "__delitem__", "__ior__", "clear", "pop", "popitem", "setdefault", "update"):
+    setattr(WeightTable, _name, _invalidate_sampler(_name))
+
+
+def make_weight_tables(conditions: dict) -> None:
+    """Replace {value: weight} dicts nested in conditions with WeightTables, in place."""
+    for key, value in conditions.items():
+        if isinstance(value, dict) and value and not isinstance(value, WeightTable):
+            if all(isinstance(weight, (int, float)) and not isinstance(weight, bool) for weight in value.values()):
+                conditions[key] = WeightTable(value)
+            else:
+                make_weight_tables(value)
+
+
+def get_random_outcome(distribution: dict, totalWeight: float = None, rng=random) -> Union[float, int]:
+    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+
+    The roll is drawn with rng.uniform(), pass the gamestate rng to draw from its backend.
+    WeightTables are sampled with their cached WeightedSampler, giving the same outcomes for the same random state.
+    """
     assert isinstance(distribution, dict), "distribution must be of type: dict "
+    if isinstance(distribution, WeightTable):
+        return distribution.get_sampler().sample(totalWeight, rng)
     if totalWeight is None:
         totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
+    roll = rng.uniform(0, totalWeight)
     cumulative = 0.0
     for value, weight in distribution.items():
         cumulative += weight
@@ -43,6 +43,7 @@ class Symbol:
         "multiplier",
         "has_prize",
         "prize",
+        "shared",
     )
 
     def __init__(self, defn: SymbolDefinition):
@@ -53,6 +54,7 @@ class Symbol:
         self.scatter = False
         self.multiplier = None
         self.prize = None
+        self.shared = False
         self.assign_default_attribute()
 
     @property
@@ -96,9 +98,23 @@ class Symbol:
 
     def assign_attribute(self, attribute_dict: dict) -> None:
         """Assign attribute value to symbol."""
+        if self.shared:
+            raise RuntimeError(
+                f"Symbol '{self.name}' is pooled and shared between board positions, "
+                "replace the board position with symbol.copy() before modifying it"
+            )
         for prop, value in attribute_dict.items():
             setattr(self, prop, value)
 
+    def copy(self):
+        """Return an unshared copy of the symbol, which can be modified."""
+        sym = Symbol.__new__(Symbol)
+        for attr in Symbol.__slots__:
+            if hasattr(self, attr):
+                setattr(sym, attr, getattr(self, attr))
+        sym.shared = False
+        return sym
+
     def assign_default_attribute(self):
         "Set inital __slots__ properties"
         for attr in self.defn.special_flags:
@@ -131,10 +147,30 @@ class SymbolStorage:
                 config=config,
                 paytable=paytable_by_symbol.get(name),
             )
+        self.pool = {}
+
+    def pool_symbols(self, exclude_names) -> None:
+        """Share a single instance of each non-special symbol, except for names in exclude_names.
+
+        Pooled symbols must not be modified in place, see explode_symbol() and Symbol.copy().
+        """
+        for name, defn in self.symbol_defs.items():
+            if not defn.special and name not in exclude_names:
+                self.pool[name] = Symbol(defn)
+                self.pool[name].shared = True
 
     def create_symbol(self, name: str):
-        """Create a new instance of symbol class."""
+        """Create a new instance of symbol class, or return the pooled instance."""
+        if name in self.pool:
+            return self.pool[name]
         try:
             return Symbol(self.symbol_defs[name])
         except KeyError:
             raise ValueError(f"Symbol '{name}' is not registered")
+
+
+def explode_symbol(board: list, reel: int, row: int) -> None:
+    """Mark a board symbol for removal, replacing a pooled symbol with its own copy first."""
+    if board[reel][row].shared:
+        board[reel][row] = board[reel][row].copy()
+    board[reel][row].explode = True
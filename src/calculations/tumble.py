@@ -11,11 +11,16 @@ class Tumble(Board):
         self.board_before_tumble = copy(self.board)
         static_board = copy(self.board)
         self.new_symbols_from_tumble = [[] for _ in range(len(static_board))]
+        self.tumbled_positions = []
 
         for reel, _ in enumerate(static_board):
             exploding_symbols = 0
             copy_reel = static_board[reel]
             exploding_symbols = sum(1 for x in static_board[reel] if x.explode)
+            if exploding_symbols > 0:
+                # symbols above the lowest exploding symbol shift down or are replaced
+                lowest_row = max(row for row, sym in enumerate(static_board[reel]) if sym.explode)
+                self.tumbled_positions += [(reel, row) for row in range(lowest_row + 1)]
 
             for i in range(exploding_symbols):
                 reel_pos = (self.reel_positions[reel] - 1) % len(self.reelstrip[reel])
@@ -45,6 +50,7 @@ class Tumble(Board):
                 self.new_symbols_from_tumble[reel].insert(0, self.top_symbols[reel])
 
         self.board = static_board
+        self.board_array = None
         self.get_special_symbols_on_board()
 
     def set_end_tumble_event(self) -> None:
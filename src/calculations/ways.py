@@ -1,7 +1,8 @@
 """Ways wins executables/calculations."""
 
-from collections import defaultdict
+import numpy as np
 from src.calculations.symbol import Symbol
+from src.calculations.board_array import BoardArray, get_paytable_matrix
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 from src.events.events import (
@@ -29,73 +30,54 @@ class Ways:
             "wins": [],
         }
         assert multiplier_strategy in ["symbol", "board", "global"]
-        board_mult_count = 0
-        potential_wins = defaultdict()
-        wilds = [[] for _ in range(len(board))]
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                sym = board[reel][row]
-                if reel == 0 and sym.name not in potential_wins:
-                    potential_wins[sym.name] = [[] for _ in range(len(board))]
-                    potential_wins[sym.name][0] = [{"reel": reel, "row": row}]
-                elif sym.name in potential_wins:
-                    potential_wins[sym.name][reel].append({"reel": reel, "row": row})
-
-                if sym.name in config.special_symbols[wild_key]:
+        num_reels = len(board)
+        wild_names = config.special_symbols[wild_key]
+        # per reel rows, ways counts and board multiplier bonuses of every symbol on the first reel
+        symbol_rows, symbol_counts, symbol_bonus = {}, {}, {}
+        wilds = [[] for _ in range(num_reels)]
+        wild_counts, wild_bonus = [0] * num_reels, [0] * num_reels
+        for reel, symbols in enumerate(board):
+            for row, sym in enumerate(symbols):
+                name = sym.name
+                if reel == 0 and name not in symbol_rows:
+                    symbol_rows[name] = [[] for _ in range(num_reels)]
+                    symbol_counts[name] = [0] * num_reels
+                    symbol_bonus[name] = [0] * num_reels
+                elif name not in symbol_rows and name not in wild_names:
+                    continue
+                mult = sym.get_attribute(multiplier_key) if sym.check_attribute(multiplier_key) else None
+                if name in symbol_rows:
+                    symbol_rows[name][reel].append(row)
+                    if mult is None or multiplier_strategy != "symbol":
+                        symbol_counts[name][reel] += 1
+                        if mult is not None and multiplier_strategy == "board":
+                            symbol_bonus[name][reel] += mult * (mult > 1)
+                    else:
+                        symbol_counts[name][reel] += mult
+
+                if name in wild_names:
                     wilds[reel].append({"reel": reel, "row": row})
-                    if board[reel][row].check_attribute(multiplier_key):
-                        wilds[reel][-1][multiplier_key] = board[reel][row].get_attribute(multiplier_key)
+                    if mult is not None:
+                        wilds[reel][-1][multiplier_key] = mult
+                    if mult is not None and multiplier_strategy in ["board", "symbol"]:
+                        wild_bonus[reel] += mult * (mult > 1)
+                        wild_counts[reel] += 1 if multiplier_strategy == "board" else mult
+                    else:
+                        wild_counts[reel] += 1
 
-        for symbol in potential_wins:
+        board_mult_count = 0
+        for symbol, rows in symbol_rows.items():
             kind, ways, cumulative_sym_mult = (0, 1, 0)
-            for reel, _ in enumerate(potential_wins[symbol]):
-                if len(potential_wins[symbol][reel]) > 0 or len(wilds[reel]) > 0:
-                    kind += 1
-                    reel_sym_count = 0
-                    # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
-                    symbols_have_mult = False
-                    for s in potential_wins[symbol][reel]:
-                        if board[s["reel"]][s["row"]].check_attribute(multiplier_key):
-                            symbols_have_mult = True
-
-                    if symbols_have_mult is False:
-                        reel_sym_count += len(potential_wins[symbol][reel])
-                    else:
-                        reel_sym_count = 0
-                        for s in potential_wins[symbol][reel]:
-                            if (
-                                board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                and multiplier_strategy == "symbol"
-                            ):
-                                reel_sym_count += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                            else:
-                                reel_sym_count += 1
-                                if (
-                                    board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                    and multiplier_strategy == "board"
-                                ):
-                                    gm = board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                                    board_mult_count += gm * (gm > 1)
-
-                    if len(wilds[reel]) > 0:
-                        for sym in wilds[reel]:
-                            if board[sym["reel"]][sym["row"]].check_attribute(
-                                multiplier_key
-                            ) and multiplier_strategy in ["board", "symbol"]:
-                                wild_mult_val = board[sym["reel"]][sym["row"]].get_attribute(multiplier_key)
-                                cumulative_sym_mult += wild_mult_val * (wild_mult_val > 1)
-                                if multiplier_strategy == "board":
-                                    reel_sym_count += 1
-                                    board_mult_count += wild_mult_val * (wild_mult_val > 1)
-                                else:
-                                    reel_sym_count += wild_mult_val
-                            else:
-                                reel_sym_count += 1
-
-                    ways *= reel_sym_count
-
-                else:
+            counts, bonus = symbol_counts[symbol], symbol_bonus[symbol]
+            for reel in range(num_reels):
+                if not (rows[reel] or wilds[reel]):
                     break
+                kind += 1
+                # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
+                ways *= counts[reel] + wild_counts[reel]
+                cumulative_sym_mult += wild_bonus[reel]
+                if multiplier_strategy == "board":
+                    board_mult_count += bonus[reel] + wild_bonus[reel]
 
             match multiplier_strategy:
                 case "global":
@@ -108,10 +90,8 @@ class Ways:
             if (kind, symbol) in config.paytable:
                 positions = []
                 for reel in range(kind):
-                    for pos in potential_wins[symbol][reel]:
-                        positions += [pos]
-                    for pos in wilds[reel]:
-                        positions += [pos]
+                    positions += [{"reel": reel, "row": row} for row in rows[reel]]
+                    positions += wilds[reel]
 
                 win = round(config.paytable[kind, symbol] * ways, 2)
                 win_amt, multiplier = apply_mult(
@@ -141,6 +121,167 @@ class Ways:
 
         return return_data
 
+    @staticmethod
+    def get_reel_counts(on_reel: np.ndarray, wilds: np.ndarray, mults: np.ndarray, multiplier_strategy: str) -> tuple:
+        """Ways counts, multiplier bonuses and kinds of symbols on boards with any leading dimensions.
+
+        on_reel is [..., symbol, reel, row], wilds and mults are [..., reel, row]. Returns the ways count of each
+        symbol per reel, the wild multiplier bonus per reel, the symbol multiplier bonus per reel (board strategy
+        only) and the number of consecutive reels holding the symbol or a wild.
+        """
+        has_mult = mults != 0
+        bonus = mults * (mults > 1)
+        # each symbol adds its multiplier to the reel count for the symbol strategy, otherwise 1
+        weight = np.where(has_mult & (multiplier_strategy == "symbol"), mults, 1)
+        reel_counts = (on_reel * weight[..., None, :, :]).sum(axis=-1) + (wilds * weight).sum(axis=-1)[..., None, :]
+        wild_bonus = (wilds * bonus).sum(axis=-1) * (multiplier_strategy in ["board", "symbol"])
+        symbol_board_bonus = (on_reel * bonus[..., None, :, :]).sum(axis=-1) * (multiplier_strategy == "board")
+
+        present = on_reel.any(axis=-1) | wilds.any(axis=-1)[..., None, :]
+        num_reels = present.shape[-1]
+        kinds = np.where(present.all(axis=-1), num_reels, np.argmin(present, axis=-1))
+        return reel_counts, wild_bonus, symbol_board_bonus, kinds
+
+    @staticmethod
+    def get_ways_data_array(
+        config: Config,
+        board: list[list[Symbol]],
+        board_array: BoardArray,
+        wild_key: str = "wild",
+        global_multiplier: int = 1,
+        multiplier_strategy: str = "symbol",
+    ):
+        """get_ways_data() evaluated on a BoardArray, the multiplier key is taken from the board array.
+
+        Symbol counts per reel (with multipliers) are computed for all reel-1 symbols at once,
+        win positions are only built for paying symbols.
+        """
+        return_data = {
+            "totalWin": 0,
+            "wins": [],
+        }
+        assert multiplier_strategy in ["symbol", "board", "global"]
+        symbol_ids = board_array.symbol_ids
+        mults = board_array.multiplier
+        has_mult = mults != 0
+        wilds = board_array.name_mask(config.special_symbols[wild_key])
+        symbols = np.array(list(dict.fromkeys(symbol_ids[0][symbol_ids[0] >= 0].tolist())))
+        on_reel = symbol_ids[None, :, :] == symbols[:, None, None]
+        reel_counts, wild_bonus, symbol_board_bonus, kinds = Ways.get_reel_counts(
+            on_reel, wilds, mults, multiplier_strategy
+        )
+        board_mult_count = 0
+        for index, symbol_id in enumerate(symbols.tolist()):
+            symbol = board_array.symbol_names[symbol_id]
+            kind = int(kinds[index])
+            ways = 1
+            for count in reel_counts[index, :kind].tolist():
+                ways *= count
+            cumulative_sym_mult = wild_bonus[:kind].sum().item()
+            if multiplier_strategy == "board":
+                board_mult_count += (symbol_board_bonus[index, :kind].sum() + wild_bonus[:kind].sum()).item()
+
+            match multiplier_strategy:
+                case "global":
+                    win_multiplier = global_multiplier
+                case "board":
+                    win_multiplier = max(board_mult_count, 1)
+                case "symbol":
+                    win_multiplier = 1
+
+            if (kind, symbol) in config.paytable:
+                positions = []
+                for reel in range(kind):
+                    for row in np.flatnonzero(on_reel[index, reel]).tolist():
+                        positions += [{"reel": reel, "row": row}]
+                    for row in np.flatnonzero(wilds[reel]).tolist():
+                        positions += [{"reel": reel, "row": row}]
+                        if has_mult[reel, row]:
+                            positions[-1][board_array.multiplier_key] = mults[reel, row].item()
+
+                win = round(config.paytable[kind, symbol] * ways, 2)
+                win_amt, multiplier = apply_mult(
+                    board=board,
+                    strategy="global",
+                    win_amount=win,
+                    global_multiplier=win_multiplier,
+                )
+                if multiplier_strategy == "symbol":
+                    assert win_amt == win
+
+                return_data["wins"] += [
+                    {
+                        "symbol": symbol,
+                        "kind": kind,
+                        "win": win_amt,
+                        "positions": positions,
+                        "meta": {
+                            "ways": ways,
+                            "globalMult": multiplier,
+                            "winWithoutMult": win,
+                            "symbolMult": cumulative_sym_mult,
+                        },
+                    }
+                ]
+                return_data["totalWin"] += win_amt
+
+        return return_data
+
+    @staticmethod
+    def get_ways_batch(
+        symbol_ids: np.ndarray,
+        config: Config,
+        symbol_names: list,
+        wild_key: str = "wild",
+        multipliers: np.ndarray = None,
+        multiplier_strategy: str = "symbol",
+        global_multiplier=1,
+    ) -> dict:
+        """Ways wins of N boards of symbol ids [board, reel, row] in one call, without win details or events.
+
+        symbol_ids index symbol_names, wilds are the config.special_symbols[wild_key] names. multipliers holds symbol
+        multiplier values with the shape of symbol_ids (0 for none), global_multiplier is a number or one value per
+        board. Returns per board "totalWin" and per board and symbol id "wins", "kinds" and "ways". Symbols that are
+        not on the first reel have kind 0.
+        """
+        assert multiplier_strategy in ["symbol", "board", "global"]
+        symbols = np.arange(len(symbol_names))
+        on_reel = symbol_ids[:, None, :, :] == symbols[None, :, None, None]
+        wild_ids = [symbol_names.index(name) for name in config.special_symbols[wild_key] if name in symbol_names]
+        wilds = np.isin(symbol_ids, wild_ids)
+        mults = np.zeros(symbol_ids.shape, dtype=int) if multipliers is None else multipliers
+        reel_counts, wild_bonus, symbol_board_bonus, kinds = Ways.get_reel_counts(
+            on_reel, wilds, mults, multiplier_strategy
+        )
+        first_reel = on_reel[:, :, 0, :].any(axis=-1)
+        kinds = np.where(first_reel, kinds, 0)
+        in_win = np.arange(reel_counts.shape[-1]) < kinds[..., None]
+        ways = np.where(in_win, reel_counts, 1).prod(axis=-1) * first_reel
+
+        paytable = get_paytable_matrix(config, symbol_names)
+        max_kind = paytable.shape[1] - 1
+        pays = np.where(kinds <= max_kind, paytable[symbols, np.minimum(kinds, max_kind)], 0)
+        wins = np.round(pays * ways, 2)
+        match multiplier_strategy:
+            case "global":
+                wins = np.round(wins * np.reshape(global_multiplier, (-1, 1)), 2)
+            case "board":
+                # board multipliers accumulate over symbols in order of their first row on reel 1
+                board_bonus = ((symbol_board_bonus + wild_bonus[:, None, :]) * in_win).sum(axis=-1)
+                first_row = np.where(first_reel, np.argmax(on_reel[:, :, 0, :], axis=-1), symbol_ids.shape[2])
+                order = np.argsort(first_row, axis=1, kind="stable")
+                cumulative = np.cumsum(np.take_along_axis(board_bonus, order, axis=1), axis=1)
+                board_mult = np.empty_like(cumulative)
+                np.put_along_axis(board_mult, order, cumulative, axis=1)
+                wins = np.round(wins * np.maximum(board_mult, 1), 2)
+
+        return {
+            "totalWin": wins.sum(axis=1),
+            "wins": wins,
+            "kinds": kinds,
+            "ways": ways,
+        }
+
     @staticmethod
     def emit_wayswin_events(gamestate) -> None:
         """Transmit win events asociated with ways wins."""
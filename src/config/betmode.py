@@ -54,10 +54,18 @@ class BetMode:
     def set_force_keys(self):
         """Initialize force keys."""
         self._force_keys = []
+        self._force_key_set = set()
 
     def add_force_key(self, force_key: list):
-        """Update force keys."""
-        self._force_keys.append(str(force_key))  # type:ignore
+        """Update force keys, keys which were already added are skipped."""
+        force_key = str(force_key)
+        if force_key not in self._force_key_set:
+            self._force_key_set.add(force_key)
+            self._force_keys.append(force_key)  # type:ignore
+
+    def has_force_key(self, force_key) -> bool:
+        """Check if a force key was added."""
+        return str(force_key) in self._force_key_set
 
     def lock_force_keys(self):
         """Finalize force keys at the end of betmode simulation."""
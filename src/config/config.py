@@ -18,6 +18,18 @@ class Config:
         self.provider_number = 1
         self.game_name = "sample_lines"
         self.output_regular_json = True  # if True, outputs .json if compression = False. If False, outputs .jsonl
+        self.json_serializer = "auto"  # "auto" uses msgspec if installed, "json" always uses the stdlib
+        self.copy_book_events = False  # if True, books store a deep copy of each event (debug shared event data)
+        self.compact_books = False  # if True, board symbols are written as indices into the fe config symbolTable
+        self.pool_symbols = False  # if True, non-special symbols share one instance, see SymbolStorage.pool_symbols()
+        self.incremental_clusters = False  # if True, clusters after a tumble are updated with Cluster.update_clusters()
+        self.rng_backend = "global"  # "global" random module, "python" per gamestate random.Random or "numpy" PCG64
+        # "frames" books and their file_hash depend on the chunk layout (threads, chunks_per_thread, shards),
+        # "recompress" writes byte-identical books for any layout, including merged shards
+        self.book_merge = "recompress"  # "recompress" writes final books as one zstd frame, "frames" copies temp frames
+        self.compression_level = 3  # zstd level of final books (and of temp books for "frames")
+        self.compression_threads = 0  # zstd workers of final books, 0 compresses in the calling thread, -1 per core
+        self.compression_long_distance = False  # if True, zstd long distance matching is enabled
         if self.game_id != "0_0_sample":
             self.construct_paths()
 
@@ -47,6 +59,7 @@ class Config:
         self.reel_location = ""
         self.reels = {}
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
+        self.reel_windows = {}  # reelstrip_id -> per reel symbol windows, built on first use
 
         self.write_event_list = True
 
@@ -139,6 +152,27 @@ class Config:
 
         return reelstrips
 
+    def get_reel_windows(self, reelstrip_id: str, symbol_names=None) -> list:
+        """Symbols visible at every stop position of a reelstrip, including the top and bottom padding symbols.
+
+        windows[reel][stop] = (top, row_0, ..., row_n, bottom), wrapping around the end of the reelstrip.
+        Reelstrip names are checked against symbol_names once, when the windows are first built.
+        """
+        if reelstrip_id not in self.reel_windows:
+            if symbol_names is not None:
+                for strip in self.reels[reelstrip_id]:
+                    for name in strip:
+                        if name not in symbol_names:
+                            raise ValueError(f"Symbol '{name}' is not registered")
+            windows = []
+            for reel, strip in enumerate(self.reels[reelstrip_id]):
+                offsets = range(-1, self.num_rows[reel] + 1)
+                windows.append(
+                    [tuple(strip[(stop + offset) % len(strip)] for offset in offsets) for stop in range(len(strip))]
+                )
+            self.reel_windows[reelstrip_id] = windows
+        return self.reel_windows[reelstrip_id]
+
     def construct_paths(self) -> None:
         """Assign all output file paths"""
         self.reels_path = os.path.join(PATH_TO_GAMES, self.game_id, "reels")
@@ -2,6 +2,7 @@
 
 from typing import Union
 import json
+from src.calculations.statistics import make_weight_tables
 
 
 class Distribution:
@@ -42,6 +43,7 @@ class Distribution:
             if rk not in condition_keys:
                 conditions[rk] = self._default_distribution_conditions[rk]
 
+        make_weight_tables(conditions)
         self._conditions = conditions
 
     def get_criteria(self):
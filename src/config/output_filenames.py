@@ -16,9 +16,8 @@ class OutputFiles:
         self.assign_lookup_details()
 
     def check_folder_exists(self, folder_path: str) -> None:
-        """Check if target folder exists, and create if it does not."""
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
+        """Check if target folder exists, and create if it does not (concurrent shards may create it at once)."""
+        os.makedirs(folder_path, exist_ok=True)
 
     def setup_output_directories(self):
         """Entrypoint for saving all output files."""
@@ -34,6 +33,7 @@ class OutputFiles:
         self.compressed_path = self.publish_path  # Required RGS files
         self.final_lookup_path = self.publish_path  # Required RGS files
         self.optimization_result_path = os.path.join(self.optimization_path, "trial_results")
+        self.shard_path = os.path.join(self.library_path, "shard_files")  # created when shards are written
 
         all_paths = [
             "library_path",
@@ -50,6 +50,12 @@ class OutputFiles:
         for p in all_paths:
             self.check_folder_exists(getattr(self, p))
 
+    def set_shard_temp_path(self, shard_index: int, num_shards: int) -> None:
+        """Keep temporary files from concurrently running shards apart."""
+        shard_folder = f"temp_multi_threaded_files_shard_{shard_index}_of_{num_shards}"
+        self.temp_path = os.path.join(self.library_path, shard_folder)
+        self.check_folder_exists(self.temp_path)
+
     def assign_config_details(self):
         """All config filenames and paths."""
         self.configs = {
@@ -142,7 +148,34 @@ class OutputFiles:
 
     def get_temp_force_name(self, betmode: str, thread_index: int, repeat_count: int):
         """Naming convention for temp force files."""
-        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.bin")
+
+    def get_temp_manifest_name(self, betmode: str):
+        """Record of temp chunks which finished writing, used to resume an interrupted run."""
+        return os.path.join(self.temp_path, f"manifest_{betmode}.jsonl")
+
+    def get_shard_book_name(self, betmode: str, shard_index: int, num_shards: int, compress: bool):
+        """Naming convention for books from one shard of a distributed run."""
+        shard_tag = f"shard_{shard_index}_of_{num_shards}"
+        if compress:
+            filename = f"books_{betmode}_{shard_tag}.jsonl.zst"
+        elif self.game_config.output_regular_json:
+            filename = f"books_{betmode}_{shard_tag}.json"
+        else:
+            filename = f"books_{betmode}_{shard_tag}.jsonl"
+        return os.path.join(self.shard_path, filename)
+
+    def get_shard_lookup_name(self, betmode: str, shard_index: int, num_shards: int):
+        """Naming convention for shard lookup files."""
+        return os.path.join(self.shard_path, f"lookUpTable_{betmode}_shard_{shard_index}_of_{num_shards}")
+
+    def get_shard_segmented_name(self, betmode: str, shard_index: int, num_shards: int):
+        """Naming convention for shard segmented lookup files."""
+        return os.path.join(self.shard_path, f"lookUpTableSegmented_{betmode}_shard_{shard_index}_of_{num_shards}")
+
+    def get_shard_force_name(self, betmode: str, shard_index: int, num_shards: int):
+        """Naming convention for shard force files."""
+        return os.path.join(self.shard_path, f"force_{betmode}_shard_{shard_index}_of_{num_shards}.bin")
 
     def get_final_book_name(self, betmode: str, compress: bool):
         """Returns final simulation books output name."""
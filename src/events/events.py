@@ -18,6 +18,30 @@ def json_ready_sym(symbol: object, special_attributes: list = None):
     return print_sym
 
 
+def make_symbol_table(gamestate) -> list:
+    """Default JSON form of every symbol, a board symbol in compact books is its index in this list."""
+    special_attributes = list(gamestate.config.special_symbols.keys())
+    return [
+        json_ready_sym(gamestate.symbol_storage.create_symbol(name), special_attributes)
+        for name in sorted(gamestate.symbol_storage.symbol_defs)
+    ]
+
+
+def board_sym(gamestate, symbol: object, special_attributes: list):
+    """JSON format of a board symbol, replacing the name with its symbol table index for compact books.
+
+    Symbols which only hold their default attributes are written as the index alone.
+    """
+    print_sym = json_ready_sym(symbol, special_attributes)
+    if not gamestate.config.compact_books:
+        return print_sym
+    index = gamestate.symbol_table_index[print_sym["name"]]
+    if print_sym == gamestate.symbol_table[index]:
+        return index
+    print_sym["name"] = index
+    return print_sym
+
+
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -25,22 +49,22 @@ def reveal_event(gamestate):
     for reel, _ in enumerate(gamestate.board):
         board_client.append([])
         for row in range(len(gamestate.board[reel])):
-            board_client[reel].append(json_ready_sym(gamestate.board[reel][row], special_attributes))
+            board_client[reel].append(board_sym(gamestate, gamestate.board[reel][row], special_attributes))
 
     if gamestate.config.include_padding:
         for reel, _ in enumerate(board_client):
-            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel], special_attributes)] + board_client[
+            board_client[reel] = [board_sym(gamestate, gamestate.top_symbols[reel], special_attributes)] + board_client[
                 reel
             ]
-            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel], special_attributes))
+            board_client[reel].append(board_sym(gamestate, gamestate.bottom_symbols[reel], special_attributes))
 
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
 
@@ -66,14 +90,14 @@ def fs_trigger_event(
             "index": len(gamestate.book.events),
             "type": EventConstants.FREESPINTRIGGER.value,
             "totalFs": gamestate.tot_fs,
-            "positions": scatter_positions,
+            "positions": [dict(pos) for pos in scatter_positions],
         }
     elif freegame_trigger:
         event = {
             "index": len(gamestate.book.events),
             "type": EventConstants.FREESPINRETRIGGER.value,
             "totalFs": gamestate.tot_fs,
-            "positions": scatter_positions,
+            "positions": [dict(pos) for pos in scatter_positions],
         }
 
     assert gamestate.tot_fs > 0, "total freegame (gamestate.tot_fs) must be >0"
@@ -246,7 +270,7 @@ def tumble_board_event(gamestate):
     new_symbols = [[] for _ in range(gamestate.config.num_reels)]
     for r, _ in enumerate(gamestate.new_symbols_from_tumble):
         if len(gamestate.new_symbols_from_tumble[r]) > 0:
-            new_symbols[r] = [json_ready_sym(s, special_attributes) for s in gamestate.new_symbols_from_tumble[r]]
+            new_symbols[r] = [board_sym(gamestate, s, special_attributes) for s in gamestate.new_symbols_from_tumble[r]]
 
     event = {
         "index": len(gamestate.book.events),
@@ -6,9 +6,10 @@ from copy import deepcopy
 class Book:
     "Stores simulation information."
 
-    def __init__(self, book_id: int, criteria: str):
+    def __init__(self, book_id: int, criteria: str, copy_events: bool = False):
         "Initialize simulation book"
         self.id = book_id
+        self.copy_events = copy_events
         self.payout_multiplier = 0.0
         self.events = []
         self.criteria = criteria
@@ -16,8 +17,15 @@ class Book:
         self.freegame_wins = 0.0
 
     def add_event(self, event: dict):
-        "Append event to book."
-        self.events.append(deepcopy(event))
+        """Append event to book.
+
+        The book takes ownership of the event, so builders must not modify it (or data it holds) afterwards.
+        With copy_events a deep copy is stored instead, to check if a builder shares data with the gamestate.
+        """
+        if self.copy_events:
+            self.events.append(deepcopy(event))
+        else:
+            self.events.append(event)
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
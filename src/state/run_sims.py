@@ -1,15 +1,19 @@
+import os
 import time
+import json
 import math
 import random
 import hashlib
-from multiprocessing import Process, Manager
+from multiprocessing import Pool
 import cProfile
 from warnings import warn
 import shutil
 import asyncio
-from typing import Dict
+from typing import Dict, List, Tuple
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.write_data.write_data import output_lookup_and_force_files, merge_shard_files
+
+FINGERPRINT_BLOCK = 1 << 20  # simulations per string joined while hashing criteria and seeds
 
 
 def create_books(
@@ -20,8 +24,28 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    chunks_per_thread: int = 4,
+    shard: Tuple[int, int] = None,
+    resume: bool = False,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """Main run-function for simulating game outcomes and outputting all files.
+
+    With threads > 1 each batch is split into threads * chunks_per_thread chunks, which are
+    handed out to whichever worker is free. Output is always merged in simulation order.
+    With shard = (shard_index, num_shards) only that share of each mode is simulated and shard
+    files are written instead, to be combined by merge_shards once all shards have finished.
+    With resume = True, chunks recorded as finished by an interrupted run with the same settings are
+    not simulated again, see get_run_fingerprint().
+    Books and verification files are byte-identical for any threads, chunks_per_thread or shard split with
+    config.book_merge = "recompress". With "frames" the compressed bytes (and file_hash) follow the chunk layout,
+    only the decompressed books are identical.
+    """
+    if shard is not None:
+        shard_index, num_shards = shard
+        if not (num_shards > 0 and 0 <= shard_index < num_shards):
+            raise ValueError(f"Invalid shard {shard}, expected (shard_index, num_shards) with 0 <= index < num_shards")
+        gamestate.output_files.set_shard_temp_path(shard_index, num_shards)
+
     for key, ns in num_sim_args.items():
         if all([ns > 0, ns > batch_size * batch_size]):
             assert (
@@ -37,6 +61,10 @@ def create_books(
 
     startTime = time.time()
     print("\nCreating books...")
+    pool = None
+    if threads > 1:
+        pool = Pool(processes=threads, initializer=init_sim_worker, initargs=(gamestate,))
+        print("All threads are online.")
     for betmode_name in num_sim_args:
         sim_counter = 0
         for bm in config.bet_modes:
@@ -54,6 +82,11 @@ def create_books(
         if num_sim_args[betmode_name] > 0:
             gamestate.betmode = betmode_name
             nsims = max(num_sim_args[betmode_name], sim_counter)
+            sim_chunks = get_sim_chunks(
+                threads, batch_size, nsims, chunks_per_thread=chunks_per_thread if pool is not None else 1
+            )
+            if shard is not None:
+                sim_chunks = get_shard_chunks(sim_chunks, shard_index, num_shards)
             run_multi_process_sims(
                 threads,
                 batch_size,
@@ -65,6 +98,11 @@ def create_books(
                 write_event_list=config.write_event_list,
                 profiling=profiling,
                 set_sim_amount=set_sim_amount,
+                pool=pool,
+                sim_chunks=sim_chunks,
+                resume=resume,
+                chunks_per_thread=chunks_per_thread if pool is not None else 1,
+                shard=shard,
             )
 
             output_lookup_and_force_files(
@@ -75,7 +113,12 @@ def create_books(
                 gamestate,
                 num_sims=nsims,
                 compress=compress,
+                chunk_ids=[(chunk, repeat) for chunk, repeat, _, _ in sim_chunks],
+                shard=shard,
             )
+    if pool is not None:
+        pool.close()
+        pool.join()
     shutil.rmtree(gamestate.output_files.temp_path)
     print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
 
@@ -106,59 +149,131 @@ def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> Dict[in
     return {i: sim_allocation[i] for i in range(min(sims, len(sim_allocation)))}
 
 
-def string_to_int(s: str) -> int:
-    "Convert criteria name to large integer value"
-    h = hashlib.sha256(s.encode()).hexdigest()
-    return int(h[:12], 16)
+def get_sim_chunks(
+    threads: int, batching_size: int, num_sims: int, chunks_per_thread: int = 1
+) -> List[Tuple[int, int, int, int]]:
+    """Split simulations into (chunk_index, repeat_count, sim_start, sim_end) ranges, ordered by simulation number.
 
+    With chunks_per_thread=1, chunk_index is the thread index and ranges match one batch per thread.
+    """
+    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    sims_per_batch = threads * int(num_sims / threads / num_repeats)
+    chunks_per_batch = threads * chunks_per_thread
+    sim_chunks = []
+    for repeat in range(num_repeats):
+        batch_start = repeat * sims_per_batch
+        for chunk in range(chunks_per_batch):
+            sim_start = batch_start + (chunk * sims_per_batch) // chunks_per_batch
+            sim_end = batch_start + ((chunk + 1) * sims_per_batch) // chunks_per_batch
+            if sim_end > sim_start:
+                sim_chunks.append((chunk, repeat, sim_start, sim_end))
+    return sim_chunks
 
-async def profile_and_visualize(
-    game_id,
-    gamestate,
-    all_betmode_configs,
-    betmode,
-    sim_allocation,
-    threads,
-    num_repeats,
-    sims_per_thread,
-    repeat,
-    compress,
-    write_event_list,
-    simulation_seeds,
-):
-    """Create flame-graph, automatically opens output on localhost."""
-    output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
-    cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list, simulation_seeds)",
-        globals(),
-        locals(),
-        output_string,
-    )
-    await asyncio.create_subprocess_exec("snakeviz", output_string)
 
+def get_shard_chunks(sim_chunks: list, shard_index: int, num_shards: int) -> List[Tuple[int, int, int, int]]:
+    """Restrict simulation chunks to the contiguous share of simulations belonging to one shard.
 
-def run_multi_process_sims(
-    threads: int,
-    batching_size: int,
-    game_id: str,
-    betmode: str,
-    gamestate: object,
-    num_sims: int = 1000000,
-    compress: bool = True,
-    write_event_list: bool = False,
-    profiling: bool = False,
-    set_sim_amount=False,
-):
-    """Setup multiprocessing manager for running all game-mode simulations."""
-    print("\nCreating books for", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    sims_per_thread = int(num_sims / threads / num_repeats)
+    Chunks on a shard boundary are clipped, so shards together cover exactly the simulations of sim_chunks.
+    """
+    covered_sims = sim_chunks[-1][3] if sim_chunks else 0
+    shard_start = (shard_index * covered_sims) // num_shards
+    shard_end = ((shard_index + 1) * covered_sims) // num_shards
+    shard_chunks = []
+    for chunk, repeat, sim_start, sim_end in sim_chunks:
+        sim_start, sim_end = max(sim_start, shard_start), min(sim_end, shard_end)
+        if sim_end > sim_start:
+            shard_chunks.append((chunk, repeat, sim_start, sim_end))
+    return shard_chunks
+
+
+def get_run_fingerprint(settings: dict, criteria_assignment: list, simulation_seeds: list) -> str:
+    """Hash of the run settings and of the criteria and seed of every simulation.
+
+    Stored with each finished chunk, so a resumed run only reuses chunks simulated with identical inputs.
+    """
+    fingerprint = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("UTF-8"))
+    for values in (criteria_assignment, simulation_seeds):
+        for start in range(0, len(values), FINGERPRINT_BLOCK):
+            fingerprint.update("\n".join(map(str, values[start : start + FINGERPRINT_BLOCK])).encode("UTF-8"))
+        fingerprint.update(b"\0")
+    return fingerprint.hexdigest()
+
+
+def get_completed_chunks(gamestate: object, betmode: str, compress: bool, fingerprint: str) -> Dict[tuple, list]:
+    """Read finished chunks from the temp manifest, mapped to their force keys.
+
+    Entries are only kept if they were written by a run with the same fingerprint and all temp files of the
+    chunk still exist.
+    """
+    completed = {}
+    other_runs = 0
+    manifest_name = gamestate.output_files.get_temp_manifest_name(betmode)
+    if not os.path.exists(manifest_name):
+        return completed
+    with open(manifest_name, "r", encoding="UTF-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written final line of an interrupted run
+            if entry.get("fingerprint") != fingerprint:
+                other_runs += 1
+                continue
+            chunk, repeat = entry["chunk"], entry["repeat"]
+            temp_files = [
+                gamestate.output_files.get_temp_multi_thread_name(betmode, chunk, repeat, compress),
+                gamestate.output_files.get_temp_force_name(betmode, chunk, repeat),
+                gamestate.output_files.get_temp_lookup_name(betmode, chunk, repeat),
+                gamestate.output_files.get_temp_segmented_name(betmode, chunk, repeat),
+            ]
+            if all(os.path.exists(f_name) for f_name in temp_files):
+                completed[(chunk, repeat, entry["sim_start"], entry["sim_end"])] = entry["force_keys"]
+    if other_runs > 0:
+        warn(f"Ignoring {other_runs} finished chunks of {betmode} simulated with other settings.")
+    return completed
+
+
+def record_completed_chunk(gamestate: object, betmode: str, sim_chunk: tuple, force_keys, fingerprint: str) -> None:
+    """Append a chunk whose temp files are fully written to the temp manifest."""
+    chunk, repeat, sim_start, sim_end = sim_chunk
+    entry = {
+        "fingerprint": fingerprint,
+        "chunk": chunk,
+        "repeat": repeat,
+        "sim_start": sim_start,
+        "sim_end": sim_end,
+        "force_keys": sorted(force_keys),
+    }
+    with open(gamestate.output_files.get_temp_manifest_name(betmode), "a", encoding="UTF-8") as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def merge_shards(gamestate: object, config: object, num_sim_args: dict, num_shards: int, compress: bool):
+    """Combine shard files written by create_books(..., shard=(k, num_shards)) into the final output files.
+
+    With config.book_merge = "recompress" the output is byte-identical to a single-host run. With "frames" the
+    compressed books and their file_hash depend on the shard split and chunk layout.
+    """
+    startTime = time.time()
+    print("\nMerging", num_shards, "shards...")
+    for betmode_name, ns in num_sim_args.items():
+        if ns > 0:
+            merge_shard_files(config.game_id, betmode_name, gamestate, num_shards, compress=compress)
+    print("\nFinished merging shards in", time.time() - startTime, "seconds.\n")
+
+
+def get_criteria_assignment(gamestate: object, betmode: str, num_sims: int, set_sim_amount: bool = False) -> tuple:
+    """Assign a criteria and seed to every simulation number of a bet mode."""
     if not set_sim_amount:
         num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
         sim_criteria = assign_sim_criteria(num_sims_criteria, num_sims)
         simulation_seeds = [i for i in range(len(sim_criteria))]
         criteria_assignment = list(sim_criteria.values())
     else:
+        # Seed the assignment so every host running a shard of this mode agrees on it.
+        random.seed(0)
         for bm in gamestate.config.bet_modes:
             if bm.get_name() == betmode:
                 dists = bm.get_distributions()
@@ -205,67 +320,226 @@ def run_multi_process_sims(
             criteria_counter[c] += 1
             simulation_seeds.append(offset_val)
 
-    for repeat in range(num_repeats):
-        print("Batch", repeat + 1, "of", num_repeats)
-        processes = []
-        manager = Manager()
-        all_betmode_configs = manager.list()
+    return criteria_assignment, simulation_seeds
+
+
+def string_to_int(s: str) -> int:
+    "Convert criteria name to large integer value"
+    h = hashlib.sha256(s.encode()).hexdigest()
+    return int(h[:12], 16)
+
+
+_worker_gamestate = None
+
+
+def init_sim_worker(gamestate: object) -> None:
+    """Hold one gamestate per worker process for the lifetime of the pool."""
+    global _worker_gamestate
+    _worker_gamestate = gamestate
+
+
+def run_sim_range(task: dict) -> tuple:
+    """Run simulations [sim_start, sim_end) on the worker gamestate and write temp files.
+
+    Returns the chunk identifiers, the force keys recorded by this worker for the bet mode and the
+    repeat statistics of the chunk.
+    """
+    gamestate = _worker_gamestate
+    gamestate.betmode = task["betmode"]
+    gamestate.config.wincap = gamestate.get_betmode(task["betmode"]).get_wincap()
+    gamestate.run_sims(
+        betmode_copy_list=None,
+        betmode=task["betmode"],
+        sim_to_criteria=task["criteria"],
+        total_threads=task["total_threads"],
+        total_repeats=task["total_repeats"],
+        num_sims=task["sim_end"] - task["sim_start"],
+        thread_index=task["thread_index"],
+        repeat_count=task["repeat_count"],
+        compress=task["compress"],
+        write_event_list=task["write_event_list"],
+        simulation_seeds=task["seeds"],
+        sim_offset=task["sim_start"],
+    )
+    force_keys = tuple(gamestate.get_betmode(task["betmode"]).get_force_keys())
+    return task["thread_index"], task["repeat_count"], force_keys, gamestate.repeat_stats
+
+
+def merge_repeat_stats(total_stats: dict, repeat_stats: dict) -> None:
+    """Add the per criteria repeat statistics of a chunk to the bet mode totals."""
+    for criteria, stats in repeat_stats.items():
+        totals = total_stats.setdefault(criteria, dict.fromkeys(stats, 0))
+        for key, value in stats.items():
+            totals[key] += value
+
+
+def print_repeat_stats(betmode: str, repeat_stats: dict) -> None:
+    """Print attempts per simulation, pre-check rejections and simulation time of each criteria."""
+    total_seconds = sum(stats["seconds"] for stats in repeat_stats.values())
+    print("Repeat statistics for", betmode)
+    for criteria, stats in repeat_stats.items():
+        share = stats["seconds"] / total_seconds if total_seconds > 0 else 0
+        print(
+            f"  {criteria:<12} sims {stats['sims']:>9}  attempts/sim {stats['attempts'] / stats['sims']:>9.2f}  "
+            f"prechecked {stats['prechecked']:>9}  time {stats['seconds']:>8.1f}s ({share:.0%})"
+        )
+
+
+async def profile_and_visualize(
+    game_id,
+    gamestate,
+    betmode,
+    sim_allocation,
+    threads,
+    num_repeats,
+    sims_per_thread,
+    thread_index,
+    repeat,
+    compress,
+    write_event_list,
+    simulation_seeds,
+    sim_offset,
+):
+    """Create flame-graph, automatically opens output on localhost."""
+    output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
+    cProfile.runctx(
+        "gamestate.run_sims(None, betmode, sim_allocation, threads, num_repeats, sims_per_thread, thread_index, "
+        "repeat, compress, write_event_list, simulation_seeds, sim_offset)",
+        globals(),
+        locals(),
+        output_string,
+    )
+    await asyncio.create_subprocess_exec("snakeviz", output_string)
+
+
+def run_multi_process_sims(
+    threads: int,
+    batching_size: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    num_sims: int = 1000000,
+    compress: bool = True,
+    write_event_list: bool = False,
+    profiling: bool = False,
+    set_sim_amount=False,
+    pool: object = None,
+    sim_chunks: list = None,
+    resume: bool = False,
+    chunks_per_thread: int = 1,
+    shard: Tuple[int, int] = None,
+):
+    """Assign criteria and seeds to all simulations, then run them in-process or on the worker pool."""
+    print("\nCreating books for", game_id, "in", betmode)
+    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    criteria_assignment, simulation_seeds = get_criteria_assignment(gamestate, betmode, num_sims, set_sim_amount)
+
+    if sim_chunks is None:
+        sim_chunks = get_sim_chunks(threads, batching_size, num_sims)
+    settings = {
+        "num_sims": num_sims,
+        "batch_size": batching_size,
+        "threads": threads,
+        "chunks_per_thread": chunks_per_thread,
+        "shard": shard,
+        "compress": compress,
+        "rng_backend": gamestate.config.rng_backend,
+        "sim_chunks": sim_chunks,
+    }
+    fingerprint = get_run_fingerprint(settings, criteria_assignment, simulation_seeds)
+
+    if resume:
+        completed_chunks = get_completed_chunks(gamestate, betmode, compress, fingerprint)
+        completed_force_keys = set()
+        for sim_chunk in sim_chunks:
+            if sim_chunk in completed_chunks:
+                completed_force_keys.update(completed_chunks[sim_chunk])
+        gamestate.merge_force_keys(completed_force_keys, betmode)
+        pending_chunks = [sim_chunk for sim_chunk in sim_chunks if sim_chunk not in completed_chunks]
+        print("Resuming with", len(sim_chunks) - len(pending_chunks), "of", len(sim_chunks), "chunks already finished.")
+    else:
+        manifest_name = gamestate.output_files.get_temp_manifest_name(betmode)
+        if os.path.exists(manifest_name):
+            os.remove(manifest_name)
+        pending_chunks = sim_chunks
+
+    if pool is not None:
+        # Workers pull chunks from the pool's shared task queue as they become free, so slow
+        # criteria (e.g. wincap) do not hold up the remaining workers at a batch boundary.
+        tasks = []
+        for chunk, repeat, sim_start, sim_end in pending_chunks:
+            tasks.append(
+                {
+                    "betmode": betmode,
+                    "criteria": criteria_assignment[sim_start:sim_end],
+                    "seeds": simulation_seeds[sim_start:sim_end],
+                    "sim_start": sim_start,
+                    "sim_end": sim_end,
+                    "total_threads": threads,
+                    "total_repeats": num_repeats,
+                    "thread_index": chunk,
+                    "repeat_count": repeat,
+                    "compress": compress,
+                    "write_event_list": write_event_list,
+                }
+            )
+        force_keys = set()
+        repeat_stats = {}
+        sim_chunk_lookup = {(c[0], c[1]): c for c in pending_chunks}
+        for finished, (chunk, repeat, chunk_force_keys, chunk_repeat_stats) in enumerate(
+            pool.imap_unordered(run_sim_range, tasks, chunksize=1)
+        ):
+            force_keys.update(chunk_force_keys)
+            merge_repeat_stats(repeat_stats, chunk_repeat_stats)
+            record_completed_chunk(gamestate, betmode, sim_chunk_lookup[(chunk, repeat)], chunk_force_keys, fingerprint)
+            print("Finished chunk", finished + 1, "of", len(tasks), flush=True)
+        gamestate.merge_force_keys(force_keys, betmode)
+        gamestate.get_betmode(betmode).lock_force_keys()
+        print_repeat_stats(betmode, repeat_stats)
+        return
+
+    repeat_stats = {}
+    for batch, (chunk, repeat, sim_start, sim_end) in enumerate(pending_chunks):
+        print("Batch", batch + 1, "of", len(pending_chunks))
         if profiling:
             asyncio.run(
                 profile_and_visualize(
                     game_id=game_id,
                     gamestate=gamestate,
-                    all_betmode_configs=all_betmode_configs,
                     betmode=betmode,
-                    sim_allocation=criteria_assignment,
+                    sim_allocation=criteria_assignment[sim_start:sim_end],
                     threads=threads,
                     num_repeats=num_repeats,
-                    sims_per_thread=sims_per_thread,
+                    sims_per_thread=sim_end - sim_start,
+                    thread_index=chunk,
                     repeat=repeat,
                     compress=compress,
                     write_event_list=write_event_list,
-                    simulation_seeds=simulation_seeds,
+                    simulation_seeds=simulation_seeds[sim_start:sim_end],
+                    sim_offset=sim_start,
                 )
             )
-        elif threads == 1:
+        else:
             gamestate.run_sims(
-                betmode_copy_list=all_betmode_configs,
+                betmode_copy_list=None,
                 betmode=betmode,
-                sim_to_criteria=criteria_assignment,
+                sim_to_criteria=criteria_assignment[sim_start:sim_end],
                 total_threads=threads,
                 total_repeats=num_repeats,
-                num_sims=sims_per_thread,
-                thread_index=0,
+                num_sims=sim_end - sim_start,
+                thread_index=chunk,
                 repeat_count=repeat,
                 compress=compress,
                 write_event_list=write_event_list,
-                simulation_seeds=simulation_seeds,
+                simulation_seeds=simulation_seeds[sim_start:sim_end],
+                sim_offset=sim_start,
             )
-        else:
-            for thread in range(threads):
-                process = Process(
-                    target=gamestate.run_sims,
-                    args=(
-                        all_betmode_configs,
-                        betmode,
-                        criteria_assignment,
-                        threads,
-                        num_repeats,
-                        sims_per_thread,
-                        thread,
-                        repeat,
-                        compress,
-                        write_event_list,
-                        simulation_seeds,
-                    ),
-                )
-                print("Started thread", thread)
-                process.start()
-                processes += [process]
-            print("All threads are online.")
-            for process in processes:
-                process.join()
-            print("Finished joining threads.")
-            gamestate.combine(all_betmode_configs, betmode)
-            gamestate.get_betmode(betmode).lock_force_keys()
-            manager.shutdown()
+        record_completed_chunk(
+            gamestate,
+            betmode,
+            (chunk, repeat, sim_start, sim_end),
+            gamestate.get_betmode(betmode).get_force_keys(),
+            fingerprint,
+        )
+        merge_repeat_stats(repeat_stats, gamestate.repeat_stats)
+    print_repeat_stats(betmode, repeat_stats)
@@ -1,21 +1,34 @@
 from copy import copy, deepcopy
 from abc import ABC, abstractmethod
 from warnings import warn
-import random
+import time
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
 from src.calculations.symbol import SymbolStorage
+from src.calculations.rng import make_rng
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
+from src.events.events import make_symbol_table
 from src.write_data.write_data import (
+    BookWriter,
+    get_book_compressor,
     print_recorded_wins,
     make_lookup_tables,
-    write_json,
     make_lookup_pay_split,
+    write_payout_sidecar,
+    add_library_events,
     write_library_events,
 )
 
+LIBRARY_KEYS = ("id", "payoutMultiplier", "criteria", "baseGameWins", "freeGameWins")
+CACHED_DESCRIPTION_TYPES = (str, int, float, bool)
+
+
+def get_description_key(description: dict) -> tuple:
+    """Cache key of a recorded description, its items with the types of all keys and values."""
+    return tuple(description.items()), tuple(map(type, description)), tuple(map(type, description.values()))
+
 
 class GeneralGameState(ABC):
     """Master gamestate which other classes inherit from."""
@@ -25,17 +38,29 @@ class GeneralGameState(ABC):
         self.output_files = OutputFiles(self.config)
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type, config.wincap)
         self.library = {}
+        self.book_writer = None
+        self.write_event_list = False
+        self.library_events = {}
         self.recorded_events = {}
+        self._book_ids_ordered = True
         self._payout_ints = []
         self.special_symbol_functions = {}
         self.temp_wins = []
+        self.descriptions = []
+        self.description_ids = {}
+        self._description_cache = {}
         self.create_symbol_map()
         self.assign_special_sym_function()
+        if self.config.pool_symbols:
+            self.symbol_storage.pool_symbols(self.special_symbol_functions)
         self.sim = 0
         self.criteria = ""
-        self.book = Book(self.sim, self.criteria)
+        self.rng = make_rng(self.config.rng_backend)
+        self.book = Book(self.sim, self.criteria, self.config.copy_book_events)
         self.repeat = True
         self.repeat_count = 0
+        self.precheck_count = 0
+        self.repeat_stats = {}
         self.win_data = {
             "totalWin": 0,
             "wins": [],
@@ -56,6 +81,8 @@ class GeneralGameState(ABC):
 
         all_symbols_list = list(all_symbols_list)
         self.symbol_storage = SymbolStorage(self.config, all_symbols_list)
+        self.symbol_table = make_symbol_table(self)
+        self.symbol_table_index = {sym["name"]: index for index, sym in enumerate(self.symbol_table)}
 
     @abstractmethod
     def assign_special_sym_function(self):
@@ -66,10 +93,12 @@ class GeneralGameState(ABC):
         """Reset global simulation variables."""
         self.temp_wins = []
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
+        self.board_array = None
+        self.tumbled_positions = None
         self.top_symbols = None
         self.bottom_symbols = None
         self.book_id = self.sim
-        self.book = Book(self.book_id, self.criteria)
+        self.book = Book(self.book_id, self.criteria, self.config.copy_book_events)
         self.win_data = {
             "totalWin": 0,
             "wins": [],
@@ -88,11 +117,12 @@ class GeneralGameState(ABC):
     def reset_seed(self, sim: int = 0, seed_override=None) -> None:
         """Reset rng seed to simulation number for reproducibility."""
         if seed_override is not None:
-            random.seed(seed_override + 1)
+            self.rng.seed(seed_override + 1)
         else:
-            random.seed(sim + 1)
+            self.rng.seed(sim + 1)
         self.sim = sim
         self.repeat_count = 0
+        self.precheck_count = 0
 
     def reset_fs_spin(self) -> None:
         """Use if using repeat during freespin games."""
@@ -142,49 +172,77 @@ class GeneralGameState(ABC):
         Freespin triggers are most commonly used, i.e {"kind": X, "symbol": "S", "gametype": "basegame"}
         It is recommended to otherwise record rare events with several keys in order to reduce the overall file-size containing many duplicate ids
         """
+        try:
+            description_id = self._description_cache[get_description_key(description)]
+        except (KeyError, TypeError):
+            description_id = self.intern_description(description)
+        self.temp_wins.append(description_id)
+        self.temp_wins.append(self.book_id)
+
+    def intern_description(self, description: dict) -> int:
+        """Return the id of a recorded description, its sorted (str(key), str(value)) items are stored on first sight.
+
+        Descriptions with str keys and str, int, float or bool values are also cached as given, so recording them
+        again skips the conversion. Their key includes the key and value types, as 2 == 2.0 but their strings differ.
+        """
         dstr = {}
         for k, v in description.items():
             dstr[str(k)] = str(v)
-        self.temp_wins.append(dstr)
-        self.temp_wins.append(self.book_id)
+        items = tuple(sorted(dstr.items()))
+        if items not in self.description_ids:
+            self.description_ids[items] = len(self.descriptions)
+            self.descriptions.append(items)
+        if all(type(k) is str and type(v) in CACHED_DESCRIPTION_TYPES for k, v in description.items()):
+            self._description_cache[get_description_key(description)] = self.description_ids[items]
+        return self.description_ids[items]
 
     def check_force_keys(self, description) -> None:
         """Check and append unique force-key parameters."""
-        current_mode_force_keys = self.get_current_betmode().get_force_keys()  # type:ignore
+        betmode = self.get_current_betmode()
         for keyValue in description:
-            if keyValue[0] not in current_mode_force_keys:
-                self.get_current_betmode().add_force_key(keyValue[0])  # type:ignore
-
-    def combine(self, modes, betmode_name) -> None:
-        """Retrieve unique force record keys."""
-        for modeConfig in modes:
-            for betmode in modeConfig:
-                if betmode.get_name() == betmode_name:
-                    break
-            force_keys = betmode.get_force_keys()  # type:ignore
-            for key in force_keys:
-                if key not in self.get_betmode(betmode_name).get_force_keys():  # type:ignore
-                    self.get_betmode(betmode_name).add_force_key(key)  # type:ignore
+            if not betmode.has_force_key(keyValue[0]):  # type:ignore
+                betmode.add_force_key(keyValue[0])  # type:ignore
+
+    def merge_force_keys(self, force_keys, betmode_name) -> None:
+        """Add force keys returned by worker processes to the bet mode, skipping existing keys."""
+        betmode = self.get_betmode(betmode_name)
+        for key in sorted(force_keys):
+            if not betmode.has_force_key(key):  # type:ignore
+                betmode.add_force_key(key)  # type:ignore
 
     def imprint_wins(self) -> None:
-        """Record all events to library if criteria conditions are satisfied."""
+        """Record all events to library if criteria conditions are satisfied.
+
+        Book ids are normally imprinted in increasing order, so a new id only has to be compared with the last id
+        recorded for the description. Once a lower id was recorded, ids are searched in the full list.
+        """
         for temp_win_index in range(int(len(self.temp_wins) / 2)):
-            description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
+            description = self.descriptions[self.temp_wins[2 * temp_win_index]]
             book_id = self.temp_wins[2 * temp_win_index + 1]
-            if description in self.recorded_events and (
-                book_id not in self.recorded_events[description]["bookIds"]
-            ):
-                self.recorded_events[description]["timesTriggered"] += 1
-                self.recorded_events[description]["bookIds"] += [book_id]
-            elif description not in self.recorded_events:
+            record = self.recorded_events.get(description)
+            if record is None:
                 self.check_force_keys(description)
                 self.recorded_events[description] = {
                     "timesTriggered": 1,
                     "bookIds": [book_id],
                 }
+            elif (book_id > record["bookIds"][-1] and self._book_ids_ordered) or (
+                book_id != record["bookIds"][-1] and book_id not in record["bookIds"]
+            ):
+                self._book_ids_ordered = self._book_ids_ordered and book_id > record["bookIds"][-1]
+                record["timesTriggered"] += 1
+                record["bookIds"].append(book_id)
         self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
-        self._payout_ints.append(self.library[self.sim + 1]["payoutMultiplier"])
+        book = self.book.to_json()
+        if self.book_writer is None:
+            self.library[self.sim + 1] = copy(book)
+        else:
+            # Events are streamed to the temp books file, only lookup table values are kept.
+            self.book_writer.write(book)
+            self.library[self.sim + 1] = {key: book[key] for key in LIBRARY_KEYS}
+            if self.write_event_list:
+                add_library_events(self.library_events, book)
+        self._payout_ints.append(book["payoutMultiplier"])
         self.win_manager.update_end_round_wins()
 
     def update_final_win(self) -> None:
@@ -211,6 +269,33 @@ class GeneralGameState(ABC):
             round(self.book.payout_multiplier, 2), round(self.config.wincap, 2)
         ), "Base + Free game payout mismatch!"
 
+    def precheck_repeat(self) -> bool:
+        """Return True if the current attempt would fail check_repeat(), called by run_spin before wins are evaluated.
+
+        Override with a cheap check of the drawn board (e.g. trigger or win amount only, without events), so rejected
+        attempts skip win evaluation and event construction. Only reject attempts which would not draw further random
+        values before check_repeat(), otherwise the random values used by later attempts (and the books) change.
+        """
+        return False
+
+    def check_early_repeat(self) -> bool:
+        """Reject the current attempt if precheck_repeat() fails, run_spin should then start the next attempt."""
+        if not self.precheck_repeat():
+            return False
+        self.repeat = True
+        self.precheck_count += 1
+        self.repeat_count += 1
+        self.check_current_repeat_count()
+        return True
+
+    def update_repeat_stats(self, seconds: float) -> None:
+        """Add attempts, pre-check rejections and run time of the finished simulation to its criteria."""
+        stats = self.repeat_stats.setdefault(self.criteria, {"sims": 0, "attempts": 0, "prechecked": 0, "seconds": 0})
+        stats["sims"] += 1
+        stats["attempts"] += max(self.repeat_count, 1)
+        stats["prechecked"] += self.precheck_count
+        stats["seconds"] += seconds
+
     def check_repeat(self) -> None:
         """Checks if the spin failed a criteria constraint at any point."""
         if self.repeat is False:
@@ -247,8 +332,13 @@ class GeneralGameState(ABC):
         compress=True,
         write_event_list=True,
         simulation_seeds=[],
+        sim_offset=None,
     ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished.
+
+        If sim_offset is given, sim_to_criteria and simulation_seeds only hold the num_sims entries
+        starting at that simulation number.
+        """
         mode_max_win = None
         for bm in self.config.bet_modes:
             if bm._name.lower() == betmode.lower():
@@ -257,15 +347,34 @@ class GeneralGameState(ABC):
 
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type, mode_max_win)
         self.library = {}
+        self.library_events = {}
+        self.write_event_list = write_event_list
         self.recorded_events = {}
+        self._book_ids_ordered = True
+        self.repeat_stats = {}
+        self._payout_ints = []
         self.betmode = betmode
         self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
-            self.criteria = sim_to_criteria[sim]
-            self.run_spin(sim, simulation_seeds[sim])
+        if sim_offset is None:
+            sim_start, list_offset = thread_index * num_sims + (total_threads * num_sims) * repeat_count, 0
+        else:
+            sim_start, list_offset = sim_offset, sim_offset
+        temp_book_name = self.output_files.get_temp_multi_thread_name(betmode, thread_index, repeat_count, compress)
+        self.book_writer = BookWriter(
+            temp_book_name,
+            self.config.output_regular_json,
+            self.config.json_serializer,
+            get_book_compressor(self.config, temp=True),
+        )
+        try:
+            for sim in range(sim_start, sim_start + num_sims):
+                self.criteria = sim_to_criteria[sim - list_offset]
+                start_time = time.perf_counter()
+                self.run_spin(sim, simulation_seeds[sim - list_offset])
+                self.update_repeat_stats(time.perf_counter() - start_time)
+        finally:
+            self.book_writer.close()
+            self.book_writer = None
         mode_cost = self.get_current_betmode().get_cost()
 
         print(
@@ -277,14 +386,12 @@ class GeneralGameState(ABC):
             flush=True,
         )
 
-        temp_book_name = self.output_files.get_temp_multi_thread_name(
-            betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-        )
-        write_json(self, temp_book_name, payout_ints=self._payout_ints)
+        write_payout_sidecar(temp_book_name, self._payout_ints)
         print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
         make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
         make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
 
         if write_event_list:
-            write_library_events(self, list(self.library.values()), betmode)
-        betmode_copy_list.append(self.config.bet_modes)
+            write_library_events(self, self.library_events, betmode)
+        if betmode_copy_list is not None:
+            betmode_copy_list.append(self.config.bet_modes)
@@ -280,6 +280,10 @@ def make_fe_config(gamestate, json_padding=True, assign_properties=True, **kwarg
     for key, val in symbols.items():
         json_info["symbols"].append({key: val})
 
+    if gamestate.config.compact_books:
+        json_info["bookFormat"] = "compact"
+        json_info["symbolTable"] = gamestate.symbol_table
+
     reelstrip_json = {}
     if json_padding:
         for idx, reels in gamestate.config.padding_reels.items():
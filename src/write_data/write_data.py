@@ -6,10 +6,38 @@ import shutil
 import os
 import hashlib
 import json
-import ast
 import pickle as _pickle
+from textwrap import indent
+import numpy as np
 import zstandard as zstd
 
+try:
+    import msgspec
+except ImportError:  # optional fast encoder, stdlib json is used without it
+    msgspec = None
+
+JSON_SERIALIZERS = ("auto", "json", "msgspec")
+BOOK_MERGES = ("recompress", "frames")
+FORCE_ID_DTYPE = np.dtype("<u4")
+PAYOUT_DTYPE = np.dtype("<u8")
+COPY_CHUNK_SIZE = 1 << 20
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+
+
+class HashingWriter:
+    """Binary file wrapper updating a hashlib object with all bytes written, so files are hashed while written."""
+
+    def __init__(self, file, hasher):
+        self.file = file
+        self.hasher = hasher
+
+    def write(self, data) -> int:
+        self.hasher.update(data)
+        return self.file.write(data)
+
+    def flush(self) -> None:
+        self.file.flush()
+
 
 def get_sha_256(file_to_hash: str):
     """Get human readable hash of file."""
@@ -104,18 +132,16 @@ def make_lookup_pay_split(gamestate: object, name: str):
     file.close()
 
 
-def write_library_events(gamestate: object, library: list, gametype: str):
+def add_library_events(event_items: dict, book: dict) -> None:
+    """Keep the first example of each event type found in a book."""
+    for instance in book["events"]:
+        lib_event = instance["type"]
+        if lib_event not in event_items:
+            event_items[lib_event] = {key: instance[key] for key in instance.keys() if key != "index"}
+
+
+def write_library_events(gamestate: object, event_items: dict, gametype: str):
     """Write all unique events within a given mode - with one example application."""
-    unique_event = []
-    event_items = {}
-    for event in library:
-        for instance in event["events"]:
-            lib_event = instance["type"]
-            if lib_event not in unique_event:
-                unique_event.append(lib_event)
-                item_keys = instance.keys()
-                dict_details = {key: instance[key] for key in item_keys if key != "index"}
-                event_items[lib_event] = dict_details
     json_object = json.dumps(event_items, indent=4)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
@@ -125,94 +151,319 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
-def output_lookup_and_force_files(
-    threads: int,
-    batching_size: int,
-    game_id: str,
-    betmode: str,
-    gamestate: object,
-    num_sims: int = 1000000,
-    compress: bool = True,
-):
-    """Combine temporary lookup tables and force files into a single output."""
-    print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
-
-    if compress:
-        final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        compressor = zstd.ZstdCompressor()
-        with open(final_out, "wb") as f_out:
-            with compressor.stream_writer(f_out, closefd=False) as writer:
+def get_payout_sidecar_name(book_name: str) -> str:
+    """Payout sidecar written next to a (temp or shard) books file."""
+    return book_name.rsplit(".", 2)[0] + ".payouts"
+
+
+def make_compressor(level: int = 3, threads: int = 0, long_distance: bool = False) -> zstd.ZstdCompressor:
+    """zstd compressor for books files. threads=0 compresses in the calling thread, -1 uses one worker per core.
+
+    The output of threads=0 differs from multithreaded output, which does not depend on the number of workers.
+    """
+    if not long_distance:
+        return zstd.ZstdCompressor(level=level, threads=threads)
+    params = zstd.ZstdCompressionParameters.from_level(level, threads=threads, enable_ldm=True)
+    return zstd.ZstdCompressor(compression_params=params)
+
+
+def get_book_compressor(config: object, temp: bool = False) -> zstd.ZstdCompressor:
+    """Compressor of final (or temp) books from the config.compression_* options.
+
+    With config.book_merge = "frames" the temp books are the frames of the final books, so they are compressed
+    with the configured level in the simulating thread. Otherwise temp books use the zstd default level.
+    """
+    if config.book_merge not in BOOK_MERGES:
+        raise ValueError(f"Unknown book merge '{config.book_merge}', expected one of {BOOK_MERGES}")
+    if not temp:
+        return make_compressor(config.compression_level, config.compression_threads, config.compression_long_distance)
+    if config.book_merge == "frames":
+        return make_compressor(config.compression_level, 0, config.compression_long_distance)
+    return zstd.ZstdCompressor()
+
+
+def combine_book_files(
+    file_list: list, out_name: str, compress: bool, hasher=None, merge: str = "recompress", compressor=None
+) -> None:
+    """Concatenate books files, in the order given, into a single books file.
+
+    Compressed books are decompressed and written as one zstd frame (merge="recompress"), or their frames are
+    copied one after another without decompression (merge="frames"). If a hashlib object is given, it is updated
+    with the bytes of the output file as they are written.
+    """
+    if merge not in BOOK_MERGES:
+        raise ValueError(f"Unknown book merge '{merge}', expected one of {BOOK_MERGES}")
+    if compress and merge == "frames":
+        with open(out_name, "wb") as f_out:
+            for filename in file_list:
+                append_file(filename, f_out, hasher)
+    elif compress:
+        compressor = zstd.ZstdCompressor() if compressor is None else compressor
+        with open(out_name, "wb") as f_out:
+            out = f_out if hasher is None else HashingWriter(f_out, hasher)
+            with compressor.stream_writer(out, closefd=False) as writer:
                 for fname in file_list:
                     dctx = zstd.ZstdDecompressor()
                     with open(fname, "rb") as f_in:
-                        with dctx.stream_reader(f_in) as reader:
+                        with dctx.stream_reader(f_in, read_across_frames=True) as reader:
                             while True:
                                 chunk = reader.read(65536)
                                 if not chunk:
                                     break
                                 writer.write(chunk)
     else:
-        with open(
-            gamestate.output_files.get_final_book_name(betmode, False),
-            "w",
-            encoding="UTF-8",
-        ) as outfile:
+        with open(out_name, "wb") as f_out:
+            outfile = f_out if hasher is None else HashingWriter(f_out, hasher)
             for id, filename in enumerate(file_list):
-                with open(filename, "r", encoding="UTF-8") as infile:
+                if filename.endswith(".jsonl"):
+                    append_file(filename, f_out, hasher)
+                    continue
+                with open(filename, "rb") as infile:
                     file_data = infile.read()
-                    if filename.endswith(".jsonl"):
-                        outfile.write(file_data)
-                    elif filename.endswith(".json"):
+                    if filename.endswith(".json"):
                         if id == 0 and len(file_list) == 1:
                             outfile.write(file_data)
                         elif id == 0 and len(file_list) > 1:
                             outfile.write(file_data[:-1])  # don't write final ']'
                         elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
+                            outfile.write(b", " + file_data[1:-1])  # don't write first or last '[/]'
                         else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
+                            outfile.write(b", " + file_data[1::])  # dont write first '[', write last ']'
+
+
+def write_force_file(name: str, force_results: dict) -> None:
+    """Write force records {description: {"timesTriggered", "bookIds"}} to a temporary (or shard) force file.
+
+    The file holds one JSON header line with the descriptions, their trigger counts and book id counts,
+    followed by the book ids of all descriptions in header order, packed as little-endian uint32.
+    """
+    header = {"descriptions": [], "timesTriggered": [], "counts": []}
+    book_ids = []
+    for description, record in force_results.items():
+        header["descriptions"].append(description)
+        header["timesTriggered"].append(int(record["timesTriggered"]))
+        header["counts"].append(len(record["bookIds"]))
+        book_ids.append(np.asarray(record["bookIds"], dtype=FORCE_ID_DTYPE))
+    with open(name, "wb") as f:
+        f.write(json.dumps(header).encode("UTF-8") + b"\n")
+        if book_ids:
+            f.write(np.concatenate(book_ids).tobytes())
+
+
+def read_force_file(name: str) -> tuple:
+    """Return the description tuples, trigger counts and per description book id arrays of a force file."""
+    with open(name, "rb") as f:
+        header = json.loads(f.readline())
+        book_ids = np.frombuffer(f.read(), dtype=FORCE_ID_DTYPE)
+    descriptions = [tuple(tuple(item) for item in description) for description in header["descriptions"]]
+    return descriptions, header["timesTriggered"], np.split(book_ids, np.cumsum(header["counts"])[:-1])
+
+
+def combine_force_files(file_list: list) -> dict:
+    """Merge temporary force records, keeping descriptions in order of first appearance and book-ids in file order."""
+    force_chunks = {}
+    for filename in file_list:
+        for description, times_triggered, book_ids in zip(*read_force_file(filename)):
+            chunks = force_chunks.setdefault(description, [0, []])
+            chunks[0] += times_triggered
+            chunks[1].append(book_ids)
+    return {
+        description: {"timesTriggered": times_triggered, "bookIds": np.concatenate(book_ids)}
+        for description, (times_triggered, book_ids) in force_chunks.items()
+    }
+
+
+def write_force_record(name: str, force_results: dict) -> None:
+    """Write force_record_<mode>.json one description at a time, formatted as json.dump(..., indent=4)."""
+    with open(name, "w", encoding="UTF-8") as f:
+        if not force_results:
+            f.write("[]")
+            return
+        f.write("[\n")
+        for index, (description, record) in enumerate(force_results.items()):
+            search = [{"name": str(key), "value": str(value)} for key, value in description]
+            entry = json.dumps({"search": search, "timesTriggered": int(record["timesTriggered"])}, indent=4)
+            book_ids = ",\n        ".join(map(str, np.asarray(record["bookIds"]).tolist()))
+            book_ids = "[\n        " + book_ids + "\n    ]" if book_ids else "[]"
+            entry = entry[: -len("\n}")] + ',\n    "bookIds": ' + book_ids + "\n}"
+            f.write((",\n" if index > 0 else "") + indent(entry, "    "))
+        f.write("\n]")
+
+
+def copy_file_range(in_fd: int, out_fd: int, count: int) -> bool:
+    """Copy count bytes between the current positions of two file descriptors inside the kernel.
+
+    Uses os.copy_file_range, else os.sendfile. Returns False if neither is supported for these files,
+    bytes already copied are not undone.
+    """
+    for copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+        if copy is None:
+            continue
+        try:
+            while count > 0:
+                if copy is os.sendfile:
+                    copied = copy(out_fd, in_fd, None, count)
+                else:
+                    copied = copy(in_fd, out_fd, count)
+                if copied == 0:
+                    break
+                count -= copied
+            return True
+        except OSError:
+            continue
+    return False
+
+
+def append_file(filename: str, outfile, hasher=None) -> None:
+    """Append the bytes of filename to a binary outfile.
+
+    Without a hasher the bytes are copied in the kernel where possible. Otherwise they are read in chunks,
+    which also update the hashlib object.
+    """
+    with open(filename, "rb") as infile:
+        if hasher is None:
+            outfile.flush()
+            if copy_file_range(infile.fileno(), outfile.fileno(), os.fstat(infile.fileno()).st_size):
+                return
+        buffer = bytearray(COPY_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            size = infile.readinto(buffer)
+            if not size:
+                break
+            if hasher is not None:
+                hasher.update(view[:size])
+            outfile.write(view[:size])
+
+
+def concatenate_files(file_list: list, out_name: str, hasher=None) -> None:
+    """Write files one after another into a single output, see append_file()."""
+    with open(out_name, "wb", buffering=0) as outfile:
+        for filename in file_list:
+            append_file(filename, outfile, hasher)
+
+
+def combine_payout_files(file_list: list) -> np.ndarray:
+    """Read integer payouts from all existing sidecar files, in order, into one packed array."""
+    payouts = [np.fromfile(sc, dtype=PAYOUT_DTYPE) for sc in file_list if os.path.exists(sc)]
+    if not payouts:
+        return np.zeros(0, dtype=PAYOUT_DTYPE)
+    return np.concatenate(payouts)
+
+
+def get_payout_hash(payouts) -> str:
+    """md5 of the pickled list of integer payouts, as checked against the lookup table by rgs_verification."""
+    return hashlib.md5(_pickle.dumps(np.asarray(payouts).tolist())).hexdigest()
 
-    print("Saving force files for", game_id, "in", betmode)
-    force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
 
-    for filename in file_list:
-        force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
-        for key in force_chunk:
-            if force_results_dict.get(key) is not None:
-                force_results_dict[key]["timesTriggered"] += force_chunk[key]["timesTriggered"]
-                force_results_dict[key]["bookIds"] += force_chunk[key]["bookIds"]
-            else:
-                force_results_dict[key] = force_chunk[key]
-
-    force_results_dict_just_for_rob = []
-    for force_combination in force_results_dict:
-        search_dict = []
-        for key in force_combination:
-            search_dict.append({"name": str(key[0]), "value": str(key[1])})
-        force_dict = {
-            "search": search_dict,
-            "timesTriggered": force_results_dict[force_combination]["timesTriggered"],
-            "bookIds": force_results_dict[force_combination]["bookIds"],
-        }
-        force_results_dict_just_for_rob.append(force_dict)
+def output_lookup_and_force_files(
+    threads: int,
+    batching_size: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    num_sims: int = 1000000,
+    compress: bool = True,
+    chunk_ids: list = None,
+    shard: tuple = None,
+):
+    """Combine temporary lookup tables and force files into a single output.
+
+    chunk_ids lists the (thread_index, repeat_count) temp file identifiers in simulation order.
+    If not given, one temp file per thread and batch is assumed.
+    If shard = (shard_index, num_shards) is given, shard files are written for merge_shard_files instead.
+    """
+    if chunk_ids is None:
+        num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+        chunk_ids = [(thread, repeat_index) for repeat_index in range(num_repeats) for thread in range(threads)]
+    output_files = gamestate.output_files
+    book_files = [output_files.get_temp_multi_thread_name(betmode, t, r, compress) for t, r in chunk_ids]
+    force_files = [output_files.get_temp_force_name(betmode, t, r) for t, r in chunk_ids]
+    lookup_files = [output_files.get_temp_lookup_name(betmode, t, r) for t, r in chunk_ids]
+    segmented_files = [output_files.get_temp_segmented_name(betmode, t, r) for t, r in chunk_ids]
+
+    if shard is None:
+        write_final_files(game_id, betmode, gamestate, compress, book_files, force_files, lookup_files, segmented_files)
+    else:
+        write_shard_files(
+            game_id, betmode, gamestate, compress, shard, book_files, force_files, lookup_files, segmented_files
+        )
+
+
+def write_shard_files(
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    compress: bool,
+    shard: tuple,
+    book_files: list,
+    force_files: list,
+    lookup_files: list,
+    segmented_files: list,
+):
+    """Combine temporary files from one shard, in the same formats as the temp files."""
+    shard_index, num_shards = shard
+    output_files = gamestate.output_files
+    output_files.check_folder_exists(output_files.shard_path)
+    print("Saving shard", shard_index, "of", num_shards, "for", game_id, "in", betmode)
+
+    shard_book_name = output_files.get_shard_book_name(betmode, shard_index, num_shards, compress)
+    config = gamestate.config
+    combine_book_files(book_files, shard_book_name, compress, None, config.book_merge, get_book_compressor(config))
+
+    write_force_file(
+        output_files.get_shard_force_name(betmode, shard_index, num_shards), combine_force_files(force_files)
+    )
+
+    concatenate_files(lookup_files, output_files.get_shard_lookup_name(betmode, shard_index, num_shards))
+    concatenate_files(segmented_files, output_files.get_shard_segmented_name(betmode, shard_index, num_shards))
+
+    sidecar_list = [get_payout_sidecar_name(b) for b in book_files if os.path.exists(get_payout_sidecar_name(b))]
+    if sidecar_list:
+        concatenate_files(sidecar_list, get_payout_sidecar_name(shard_book_name))
+
+
+def merge_shard_files(game_id: str, betmode: str, gamestate: object, num_shards: int, compress: bool = True):
+    """Combine the shard files of all num_shards shards into the final output files."""
+    output_files = gamestate.output_files
+    shards = range(num_shards)
+    book_files = [output_files.get_shard_book_name(betmode, k, num_shards, compress) for k in shards]
+    force_files = [output_files.get_shard_force_name(betmode, k, num_shards) for k in shards]
+    lookup_files = [output_files.get_shard_lookup_name(betmode, k, num_shards) for k in shards]
+    segmented_files = [output_files.get_shard_segmented_name(betmode, k, num_shards) for k in shards]
+    for filename in book_files + force_files + lookup_files + segmented_files:
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"Missing shard file: {filename}")
+
+    write_final_files(game_id, betmode, gamestate, compress, book_files, force_files, lookup_files, segmented_files)
+
+
+def write_final_files(
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    compress: bool,
+    book_files: list,
+    force_files: list,
+    lookup_files: list,
+    segmented_files: list,
+):
+    """Write final books, force, lookup and verification files from ordered temp (or shard) files."""
+    print("Saving books for ", game_id, "in", betmode)
+    book_hash = hashlib.sha256()
+    combine_book_files(
+        book_files,
+        gamestate.output_files.get_final_book_name(betmode, compress),
+        compress,
+        book_hash,
+        gamestate.config.book_merge,
+        get_book_compressor(gamestate.config),
+    )
 
-    json_object_for_rob = json.dumps(force_results_dict_just_for_rob, indent=4)
+    print("Saving force files for", game_id, "in", betmode)
+    force_results_dict = combine_force_files(force_files)
     force_record_path = os.path.join(gamestate.output_files.force_path, f"force_record_{betmode}.json")
-    with open(force_record_path, "w", encoding="UTF-8") as file:
-        file.write(json_object_for_rob)
+    write_force_record(force_record_path, force_results_dict)
 
     forceResultKeys = get_force_options(force_results_dict)
     json_file_path = os.path.join(gamestate.output_files.force_path, "force.json")
@@ -221,31 +472,13 @@ def output_lookup_and_force_files(
             data = json.load(file)
     except FileNotFoundError:
         data = {}
-    data[gamestate.get_current_betmode().get_name()] = forceResultKeys
+    data[betmode] = forceResultKeys
     json_object = json.dumps(data, indent=4)
     with open(json_file_path, "w", encoding="UTF-8") as file:
         file.write(json_object)
 
-    weights_plus_wins_file_list = []
-    segmented_lut_file_list = []
     print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
-
-    with open(
-        gamestate.output_files.get_final_lookup_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in weights_plus_wins_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
+    concatenate_files(lookup_files, gamestate.output_files.get_final_lookup_name(betmode))
 
     # Write _0 file if it does not exist
     if not (os.path.exists(gamestate.output_files.get_optimized_lookup_name(betmode))):
@@ -253,39 +486,16 @@ def output_lookup_and_force_files(
             gamestate.output_files.get_final_lookup_name(betmode),
             gamestate.output_files.get_optimized_lookup_name(betmode),
         )
-    with open(
-        gamestate.output_files.get_final_segmented_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in segmented_lut_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
+    concatenate_files(segmented_files, gamestate.output_files.get_final_segmented_name(betmode))
 
     # Build verification.json from payout sidecars
-    sidecar_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            temp_name = gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            sidecar_name = temp_name.rsplit(".", 2)[0] + ".payouts"
-            if os.path.exists(sidecar_name):
-                sidecar_list.append(sidecar_name)
+    sidecar_list = [get_payout_sidecar_name(b) for b in book_files if os.path.exists(get_payout_sidecar_name(b))]
     if sidecar_list:
-        merged_payouts = []
-        for sc in sidecar_list:
-            with open(sc, "r", encoding="UTF-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        merged_payouts.append(int(line))
-
-        payout_hash = hashlib.md5(_pickle.dumps(merged_payouts)).hexdigest()
-        book_file = gamestate.output_files.get_final_book_name(betmode, compress)
-        file_hash = get_sha_256(book_file)
+        merged_payouts = combine_payout_files(sidecar_list)
 
         verification = {
-            "payout_hash": payout_hash,
-            "file_hash": file_hash,
+            "payout_hash": get_payout_hash(merged_payouts),
+            "file_hash": book_hash.hexdigest(),
             "num_entries": len(merged_payouts),
         }
         verification_path = os.path.join(gamestate.output_files.config_path, f"books_{betmode}.verification.json")
@@ -294,35 +504,97 @@ def output_lookup_and_force_files(
         print(f"Wrote verification file: {verification_path}")
 
 
-def write_json(gamestate, filename: str, payout_ints=None):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    json_objects = [json.dumps(item) for item in gamestate.library.values()]
-    combined_data = "\n".join(json_objects) + "\n"
+def dumps_json(obj) -> bytes:
+    """Reference book encoding, stdlib json.dumps with default separators."""
+    return json.dumps(obj).encode("UTF-8")
 
-    if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
-        with open(filename, "wb") as f:
-            f.write(compressed_data)
-    else:
-        with open(filename, "w", encoding="UTF-8") as f:
-            if not (gamestate.config.output_regular_json):
-                f.write(combined_data)
-            else:
-                j_regular = [item for item in gamestate.library.values()]
-                f.write(json.dumps(j_regular))
 
-    # Write payout sidecar if captured at imprint_wins
-    if payout_ints is not None:
-        sidecar_name = filename.rsplit(".", 2)[0] + ".payouts"
-        with open(sidecar_name, "w", encoding="UTF-8") as f:
-            for p in payout_ints:
-                f.write(f"{p}\n")
+def make_msgspec_dumps():
+    """Encode with msgspec, producing the same bytes as dumps_json.
+
+    msgspec.json.format(indent=0) restores the ', ' and ': ' separators used by the stdlib.
+    Output which could still differ (non-ascii or DEL characters, NaN/Infinity written as null,
+    exponent or very small floats) falls back to dumps_json.
+    """
+    encode, json_format = msgspec.json.Encoder().encode, msgspec.json.format
+
+    def dumps(obj) -> bytes:
+        try:
+            data = json_format(encode(obj), indent=0)
+        except (TypeError, ValueError, OverflowError):
+            return dumps_json(obj)
+        if (
+            not data.isascii()
+            or b"\x7f" in data
+            or b"null" in data
+            or b"0.0000" in data
+            or b"0e" in data.translate(_DIGITS_TO_ZERO)
+        ):
+            return dumps_json(obj)
+        return data
+
+    return dumps
+
+
+def get_json_serializer(name: str = "auto"):
+    """Return a function encoding a book to JSON bytes, identical for every serializer choice."""
+    if name not in JSON_SERIALIZERS:
+        raise ValueError(f"Unknown json serializer '{name}', expected one of {JSON_SERIALIZERS}")
+    if name == "msgspec" and msgspec is None:
+        raise ImportError("json serializer 'msgspec' requires the msgspec package")
+    if name == "json" or msgspec is None:
+        return dumps_json
+    return make_msgspec_dumps()
+
+
+class BookWriter:
+    """Stream books to a temp books file as they are imprinted, instead of holding them in memory."""
+
+    def __init__(self, filename: str, output_regular_json: bool = False, serializer: str = "auto", compressor=None):
+        self.filename = filename
+        self.regular_json = output_regular_json and not filename.endswith(".zst")
+        self.num_books = 0
+        self._dumps = get_json_serializer(serializer)
+        if filename.endswith(".zst"):
+            self._file = open(filename, "wb")
+            compressor = zstd.ZstdCompressor() if compressor is None else compressor
+            self._writer = compressor.stream_writer(self._file, closefd=False)
+        else:
+            self._file = open(filename, "w", encoding="UTF-8")
+            self._writer = None
+        if self.regular_json:
+            self._write(b"[")
+
+    def _write(self, data: bytes) -> None:
+        if self._writer is not None:
+            self._writer.write(data)
+        else:
+            self._file.write(data.decode("UTF-8"))
+
+    def write(self, book: dict) -> None:
+        """Serialise a single book, as one line for .jsonl or one array item for .json output."""
+        if self.regular_json:
+            self._write(self._dumps(book) if self.num_books == 0 else b", " + self._dumps(book))
+        else:
+            self._write(self._dumps(book) + b"\n")
+        self.num_books += 1
+
+    def close(self) -> None:
+        """Finish the array or zstd frame and close the file."""
+        if self.regular_json:
+            self._write(b"]")
+        elif self.num_books == 0:
+            self._write(b"\n")
+        if self._writer is not None:
+            self._writer.close()
+        self._file.close()
+
+
+def write_payout_sidecar(filename: str, payout_ints: list) -> None:
+    """Write integer payouts next to a books file, packed as little-endian uint64, used to build verification.json."""
+    np.asarray(payout_ints, dtype=PAYOUT_DTYPE).tofile(get_payout_sidecar_name(filename))
 
 
 def print_recorded_wins(gamestate: object, name: str = ""):
-    """Temporary file generation for wins/recorded results."""
-    json_object = json.dumps(str(gamestate.recorded_events), indent=4)
-    file = open(name, "w", encoding="UTF-8")
-    file.write(json_object)
-    file.close()
+    """Temporary file generation for wins/recorded results, see write_force_file()."""
+    write_force_file(name, gamestate.recorded_events)
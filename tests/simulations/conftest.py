@@ -0,0 +1,23 @@
+"""Shared fixtures for tests simulating the sample games."""
+
+import json
+import pytest
+
+from utils.game_loader import load_game, simulate_books
+
+
+def run_game_books(game_id: str, betmode: str, num_sims: int, setup=None) -> list:
+    """Books of num_sims simulations of a sample game, as written to JSON.
+
+    setup(config, gamestate) is called on the loaded game before simulating, e.g. to toggle a config option.
+    """
+    config, gamestate = load_game(game_id)
+    if setup is not None:
+        setup(config, gamestate)
+    return json.loads(json.dumps(simulate_books(gamestate, betmode, num_sims)))
+
+
+@pytest.fixture
+def run_books():
+    """run_game_books(game_id, betmode, num_sims, setup=None)."""
+    return run_game_books
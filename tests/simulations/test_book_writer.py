@@ -0,0 +1,64 @@
+"""Test streaming of books to temp files."""
+
+import json
+import pytest
+import zstandard as zstd
+
+from src.write_data.write_data import BookWriter, get_json_serializer, msgspec
+
+BOOKS = [
+    {"id": 1, "payoutMultiplier": 0, "events": [{"index": 0, "type": "reveal"}], "criteria": "0"},
+    {"id": 2, "payoutMultiplier": 150, "events": [], "criteria": "basegame"},
+]
+
+
+def write_books(filename, books, output_regular_json=False):
+    writer = BookWriter(filename, output_regular_json)
+    for book in books:
+        writer.write(book)
+    writer.close()
+
+
+@pytest.mark.parametrize("books", [BOOKS, []])
+def test_jsonl_matches_joined_books(tmp_path, books):
+    "Compressed and plain jsonl output hold one book per line."
+    expected = "\n".join(json.dumps(book) for book in books) + "\n"
+    write_books(str(tmp_path / "books.jsonl"), books)
+    write_books(str(tmp_path / "books.jsonl.zst"), books)
+
+    assert (tmp_path / "books.jsonl").read_text(encoding="UTF-8") == expected
+    with open(tmp_path / "books.jsonl.zst", "rb") as f:
+        assert zstd.ZstdDecompressor().stream_reader(f).read().decode("UTF-8") == expected
+
+
+@pytest.mark.parametrize("books", [BOOKS, BOOKS[:1], []])
+def test_regular_json_matches_json_array(tmp_path, books):
+    "Regular json output is a single json array."
+    write_books(str(tmp_path / "books.json"), books, output_regular_json=True)
+    assert (tmp_path / "books.json").read_text(encoding="UTF-8") == json.dumps(books)
+
+
+SERIALIZERS = [
+    "json",
+    pytest.param("msgspec", marks=pytest.mark.skipif(msgspec is None, reason="msgspec not installed")),
+]
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS)
+def test_serializers_match_stdlib(serializer):
+    "Every serializer writes the same bytes as json.dumps, including values it hands back to the stdlib."
+    dumps = get_json_serializer(serializer)
+    values = [
+        BOOKS,
+        {"floats": [1.0, -0.0, 0.1, 12.34, 1e15, 1e16, 1.5e-5, 2.5e-8, 123456.789]},
+        {"strings": ["a, b", "x: y", 'q"uote', "back\\slash", "\n\t", "\x7f", "\u00e9", "null"]},
+        {"special": [float("nan"), float("inf"), None, True, 2**70], 1: "int key"},
+    ]
+    for value in values:
+        assert dumps(value) == json.dumps(value).encode("UTF-8")
+
+
+def test_unknown_serializer():
+    "Unknown serializer names are rejected."
+    with pytest.raises(ValueError):
+        get_json_serializer("yaml")
@@ -0,0 +1,20 @@
+"""Test event ownership within books."""
+
+from src.state.books import Book
+
+
+def test_add_event_takes_ownership():
+    "Events are stored without copying by default."
+    book = Book(1, "basegame")
+    event = {"index": 0, "type": "reveal", "board": [[{"name": "L1"}]]}
+    book.add_event(event)
+    assert book.events[0] is event
+
+
+def test_add_event_copy_events():
+    "With copy_events later changes to the event do not reach the book."
+    book = Book(1, "basegame", copy_events=True)
+    event = {"index": 0, "type": "reveal", "board": [[{"name": "L1"}]]}
+    book.add_event(event)
+    event["board"][0][0]["name"] = "H1"
+    assert book.events[0]["board"][0][0]["name"] == "L1"
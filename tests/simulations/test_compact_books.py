@@ -0,0 +1,34 @@
+"""Test that compact books decode back to the standard book format."""
+
+import json
+import pytest
+
+from utils.decode_books import decode_book, decode_sym
+
+
+def set_compact(compact, symbol_tables):
+    def setup(config, gamestate):
+        config.compact_books = compact
+        symbol_tables.append(gamestate.symbol_table)
+
+    return setup
+
+
+@pytest.mark.parametrize("game_id, betmode", [("0_0_cluster", "base"), ("0_0_scatter", "bonus"), ("0_0_lines", "base")])
+def test_compact_books_round_trip(game_id, betmode, run_books):
+    "Decoded compact books are identical to books written in the standard format."
+    symbol_tables = []
+    books = run_books(game_id, betmode, 20, set_compact(False, symbol_tables))
+    compact_books = run_books(game_id, betmode, 20, set_compact(True, symbol_tables))
+    symbol_table = symbol_tables[-1]
+
+    assert len(json.dumps(compact_books)) < len(json.dumps(books))
+    assert [decode_book(book, symbol_table) for book in compact_books] == books
+
+
+def test_decode_sym():
+    "Indices expand to table entries, symbols holding extra attributes keep them."
+    table = [{"name": "H1"}, {"name": "W", "wild": True, "multiplier": 1}]
+    assert decode_sym(0, table) == {"name": "H1"}
+    assert decode_sym({"name": 1, "wild": True, "multiplier": 5}, table) == {"name": "W", "wild": True, "multiplier": 5}
+    assert decode_sym({"name": "H1"}, table) == {"name": "H1"}
@@ -0,0 +1,120 @@
+"""Test that create_books output does not depend on threads, chunks, shards or resuming an interrupted run."""
+
+import json
+import multiprocessing
+import os
+
+import pytest
+import zstandard as zstd
+
+from src.config import output_filenames
+from src.state import run_sims
+from src.state.run_sims import create_books, merge_shards
+from utils.game_loader import load_game
+
+GAME_ID = "0_0_lines"
+NUM_SIMS = 120
+BATCH_SIZE = 20
+
+
+def load_game_in(root):
+    """Load the sample game with its library (all output files) inside root."""
+    output_filenames.PATH_TO_GAMES = str(root)
+    return load_game(GAME_ID)
+
+
+def run_create_books(root, threads=1, chunks_per_thread=4, shard=None, resume=False, num_sims=NUM_SIMS, compress=True):
+    config, gamestate = load_game_in(root)
+    create_books(
+        gamestate, config, {"base": num_sims}, BATCH_SIZE, threads, compress, False, chunks_per_thread, shard, resume
+    )
+    return gamestate
+
+
+def run_shard(args):
+    root, shard_index, num_shards = args
+    run_create_books(root, shard=(shard_index, num_shards))
+
+
+def read_outputs(gamestate):
+    """Decompressed books, lookup tables, force record and verification file of the base mode."""
+    output_files = gamestate.output_files
+    names = [
+        output_files.get_final_book_name("base", True),
+        output_files.get_final_lookup_name("base"),
+        output_files.get_final_segmented_name("base"),
+        os.path.join(output_files.force_path, "force_record_base.json"),
+        os.path.join(output_files.config_path, "books_base.verification.json"),
+    ]
+    outputs = {}
+    for name in names:
+        with open(name, "rb") as f:
+            if name.endswith(".zst"):
+                with zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+                    outputs[os.path.basename(name)] = reader.read()
+            else:
+                outputs[os.path.basename(name)] = f.read()
+    return outputs
+
+
+@pytest.fixture
+def game_root(tmp_path, monkeypatch):
+    """Folders for the output of each run, the games path is restored afterwards."""
+    monkeypatch.setattr(output_filenames, "PATH_TO_GAMES", output_filenames.PATH_TO_GAMES)
+    return lambda name: tmp_path / name
+
+
+@pytest.fixture
+def single_thread_outputs(game_root):
+    return read_outputs(run_create_books(game_root("threads_1")))
+
+
+def test_pool_chunks(game_root, single_thread_outputs):
+    "Two worker processes with three chunks per thread write the single thread output."
+    gamestate = run_create_books(game_root("threads_2"), threads=2, chunks_per_thread=3)
+    assert read_outputs(gamestate) == single_thread_outputs
+
+
+def test_shards(game_root, single_thread_outputs):
+    "Three shards run as separate processes and merged write the single thread output."
+    root = game_root("shards")
+    with multiprocessing.get_context("fork").Pool(3) as pool:
+        pool.map(run_shard, [(root, shard_index, 3) for shard_index in range(3)])
+    config, gamestate = load_game_in(root)
+    merge_shards(gamestate, config, {"base": NUM_SIMS}, 3, True)
+    assert read_outputs(gamestate) == single_thread_outputs
+
+
+@pytest.mark.parametrize("interrupted_sims", [NUM_SIMS, 80])
+def test_resume(game_root, monkeypatch, capsys, single_thread_outputs, interrupted_sims):
+    "An interrupted run is resumed only if it had the same settings, 80 sims give other criteria for sims 0-19."
+    record_completed_chunk = run_sims.record_completed_chunk
+
+    def interrupting_record(*args):
+        record_completed_chunk(*args)
+        raise KeyboardInterrupt
+
+    root = game_root("resume")
+    monkeypatch.setattr(run_sims, "record_completed_chunk", interrupting_record)
+    with pytest.raises(KeyboardInterrupt):
+        run_create_books(root, num_sims=interrupted_sims)
+    monkeypatch.setattr(run_sims, "record_completed_chunk", record_completed_chunk)
+    capsys.readouterr()
+    if interrupted_sims == NUM_SIMS:
+        gamestate = run_create_books(root, resume=True)
+        assert "Resuming with 1 of 6 chunks already finished." in capsys.readouterr().out
+    else:
+        with pytest.warns(UserWarning, match="simulated with other settings"):
+            gamestate = run_create_books(root, resume=True)
+        assert "Resuming with 0 of 6 chunks already finished." in capsys.readouterr().out
+    assert read_outputs(gamestate) == single_thread_outputs
+
+
+def test_regular_json_chunks(game_root):
+    "Uncompressed regular JSON books are json.dumps of all books, whatever the number of chunks."
+    books = []
+    for name, threads in [("json_threads_1", 1), ("json_threads_2", 2)]:
+        gamestate = run_create_books(game_root(name), threads=threads, chunks_per_thread=3, compress=False)
+        with open(gamestate.output_files.get_final_book_name("base", False), "rb") as f:
+            books.append(f.read())
+    assert books[0] == books[1] == json.dumps(json.loads(books[0])).encode("UTF-8")
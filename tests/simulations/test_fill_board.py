@@ -0,0 +1,68 @@
+"""Test that boards filled from precomputed reel windows match indexing the reelstrips directly."""
+
+import pytest
+
+from utils.game_loader import load_game
+
+
+def expected_board(config, reelstrip_id, reel_positions):
+    """Board, top and bottom names and padding positions indexed as strip[(position + offset) % len(strip)]."""
+    board, top, bottom, padding_positions = [], [], [], []
+    for reel, strip in enumerate(config.reels[reelstrip_id]):
+        pos, rows = reel_positions[reel], config.num_rows[reel]
+        board.append([strip[(pos + row) % len(strip)] for row in range(rows)])
+        top.append(strip[(pos - 1) % len(strip)])
+        bottom.append(strip[(pos + rows) % len(strip)])
+        padding_positions.append((pos + rows + 1) % len(strip))
+    return board, top, bottom, padding_positions
+
+
+def filled_board(gamestate):
+    return (
+        [[sym.name for sym in reel] for reel in gamestate.board],
+        [sym.name for sym in gamestate.top_symbols],
+        [sym.name for sym in gamestate.bottom_symbols],
+        gamestate.padding_position,
+    )
+
+
+@pytest.fixture
+def gamestate():
+    config, gamestate = load_game("0_0_lines")
+    gamestate.reset_seed(0)
+    gamestate.reset_book()
+    gamestate.gametype = config.basegame_type
+    return gamestate
+
+
+def test_fill_board(gamestate):
+    "Random boards of every reelstrip match the modular indexing of the reelstrip."
+    for reelstrip_id in gamestate.config.reels:
+        for _ in range(200):
+            gamestate.force_board_from_reelstrips(reelstrip_id, {})
+            assert filled_board(gamestate) == expected_board(gamestate.config, reelstrip_id, gamestate.reel_positions)
+
+
+def test_fill_forced_board(gamestate):
+    "Forced stops at the start and end of the reelstrips, including negative stop positions, wrap around."
+    config = gamestate.config
+    negative_stops = 0
+    for seed in range(50):
+        gamestate.reset_seed(seed)
+        for reelstrip_id, strips in config.reels.items():
+            stops = {reel: 0 if (seed + reel) % 2 else len(strip) - 1 for reel, strip in enumerate(strips)}
+            gamestate.force_board_from_reelstrips(reelstrip_id, stops)
+            negative_stops += sum(pos < 0 for pos in gamestate.reel_positions)
+            assert filled_board(gamestate) == expected_board(config, reelstrip_id, gamestate.reel_positions)
+    assert negative_stops > 0
+
+
+def test_unregistered_reel_symbol(gamestate):
+    "A reelstrip name without a symbol definition raises the same error as create_symbol."
+    config = gamestate.config
+    config.reels["BR0"][2] = config.reels["BR0"][2][:10] + ["ZZ"] + config.reels["BR0"][2][11:]
+    config.reel_windows.clear()
+    with pytest.raises(ValueError, match="Symbol 'ZZ' is not registered"):
+        gamestate.force_board_from_reelstrips("BR0", {})
+    with pytest.raises(ValueError, match="Symbol 'ZZ' is not registered"):
+        gamestate.create_symbol("ZZ")
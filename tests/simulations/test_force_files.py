@@ -0,0 +1,68 @@
+"""Test the binary temp force files and the force_record output built from them."""
+
+import json
+import random
+
+from src.write_data.write_data import combine_force_files, read_force_file, write_force_file, write_force_record
+
+
+def make_recorded_events(rng, first_id, num_books):
+    """Recorded events as built by imprint_wins, for books [first_id, first_id + num_books)."""
+    descriptions = [
+        (("gametype", "basegame"), ("kind", str(kind)), ("symbol", symbol)) for kind in (3, 4, 5) for symbol in "HL"
+    ] + [(("symbol", "scatter"),), ()]
+    recorded_events = {}
+    for book_id in range(first_id, first_id + num_books):
+        for description in rng.sample(descriptions, rng.randint(0, 3)):
+            record = recorded_events.setdefault(description, {"timesTriggered": 0, "bookIds": []})
+            record["timesTriggered"] += 1
+            record["bookIds"].append(book_id)
+    return recorded_events
+
+
+def reference_force_record(chunks):
+    """force_record JSON as built from merged Python lists."""
+    merged = {}
+    for chunk in chunks:
+        for description, record in chunk.items():
+            merged.setdefault(description, {"timesTriggered": 0, "bookIds": []})
+            merged[description]["timesTriggered"] += record["timesTriggered"]
+            merged[description]["bookIds"] += record["bookIds"]
+    records = [
+        {
+            "search": [{"name": key, "value": value} for key, value in description],
+            "timesTriggered": record["timesTriggered"],
+            "bookIds": record["bookIds"],
+        }
+        for description, record in merged.items()
+    ]
+    return json.dumps(records, indent=4)
+
+
+def test_force_file_round_trip(tmp_path):
+    "Descriptions, trigger counts and book ids are read back in order."
+    recorded_events = make_recorded_events(random.Random(1), 1, 200)
+    write_force_file(str(tmp_path / "force.bin"), recorded_events)
+    descriptions, times_triggered, book_ids = read_force_file(str(tmp_path / "force.bin"))
+    assert descriptions == list(recorded_events)
+    assert times_triggered == [record["timesTriggered"] for record in recorded_events.values()]
+    assert [ids.tolist() for ids in book_ids] == [record["bookIds"] for record in recorded_events.values()]
+
+
+def test_force_record_matches_json(tmp_path):
+    "Combined force files give the same force_record file as json.dumps of the merged records."
+    rng = random.Random(2)
+    chunks = [make_recorded_events(rng, first_id, 150) for first_id in (1, 151, 301, 451)]
+    chunks.insert(2, {})
+    file_list = []
+    for index, chunk in enumerate(chunks):
+        file_list.append(str(tmp_path / f"force_{index}.bin"))
+        write_force_file(file_list[-1], chunk)
+
+    write_force_record(str(tmp_path / "force_record.json"), combine_force_files(file_list))
+    with open(tmp_path / "force_record.json", "r", encoding="UTF-8") as f:
+        assert f.read() == reference_force_record(chunks)
+
+    write_force_record(str(tmp_path / "empty.json"), combine_force_files(file_list[2:3]))
+    with open(tmp_path / "empty.json", "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps([], indent=4)
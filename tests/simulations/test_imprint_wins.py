@@ -0,0 +1,76 @@
+"""Test recording of force descriptions and force keys in imprint_wins."""
+
+import random
+
+from utils.game_loader import load_game
+
+
+def reference_record(recorded_events, description, book_id):
+    """Recorded events with a list membership check for every book id."""
+    if description not in recorded_events:
+        recorded_events[description] = {"timesTriggered": 1, "bookIds": [book_id]}
+    elif book_id not in recorded_events[description]["bookIds"]:
+        recorded_events[description]["timesTriggered"] += 1
+        recorded_events[description]["bookIds"] += [book_id]
+
+
+def test_imprint_wins_dedup():
+    "Book ids are recorded once per description, in first-seen order, including out of order ids."
+    _, gamestate = load_game("0_0_lines")
+    gamestate.betmode = "base"
+    rng = random.Random(0)
+    expected = {}
+    book_ids = list(range(1, 300)) + [5, 150, 299, 1000, 7]
+    for book_id in book_ids:
+        gamestate.book_id = book_id
+        for _ in range(rng.randint(0, 4)):
+            description = {"kind": rng.choice([3, 4]), "symbol": rng.choice(["H1", "L1"])}
+            gamestate.record(description)
+            reference_record(expected, tuple(sorted((str(k), str(v)) for k, v in description.items())), book_id)
+        gamestate.imprint_wins()
+    assert gamestate.recorded_events == expected
+    assert list(gamestate.recorded_events) == list(expected)
+    assert list(gamestate.get_betmode("base").get_force_keys()) == ["kind", "symbol"]
+
+
+def test_force_keys_unique():
+    "Force keys are added once, in insertion order, and merged keys are skipped if present."
+    _, gamestate = load_game("0_0_lines")
+    betmode = gamestate.get_betmode("base")
+    for key in ["symbol", "kind", "symbol"]:
+        betmode.add_force_key(key)
+    gamestate.merge_force_keys({"gametype", "kind"}, "base")
+    assert betmode.get_force_keys() == ["symbol", "kind", "gametype"]
+    assert betmode.has_force_key("kind") and not betmode.has_force_key("mult")
+
+
+def test_description_ids():
+    "Equal descriptions share an id, values that print differently (3 and 3.0, 1 and True) do not."
+    _, gamestate = load_game("0_0_lines")
+    gamestate.book_id = 1
+    for description in [
+        {"kind": 3, "mult": 3},
+        {"mult": 3, "kind": 3},
+        {"kind": 3, "mult": 3.0},
+        {"kind": 3, "mult": 1},
+    ]:
+        gamestate.record(description)
+    gamestate.record({"kind": 3, "mult": True})
+    gamestate.record({"kind": 3, "mult": [2, 3]})
+    assert gamestate.temp_wins[::2] == [0, 0, 1, 2, 3, 4]
+    assert gamestate.descriptions[1] == (("kind", "3"), ("mult", "3.0"))
+    assert gamestate.descriptions[4] == (("kind", "3"), ("mult", "[2, 3]"))
+
+
+def test_description_ids_uncached_types():
+    "Nested values and non-str keys that compare equal but print differently stay separate descriptions."
+    _, gamestate = load_game("0_0_lines")
+    gamestate.book_id = 1
+    for description in [{"kind": (3, 2.0), "symbol": "H1"}, {"kind": (3, 2), "symbol": "H1"}, {True: "x"}, {1: "x"}]:
+        gamestate.record(description)
+    assert [gamestate.descriptions[index] for index in gamestate.temp_wins[::2]] == [
+        (("kind", "(3, 2.0)"), ("symbol", "H1")),
+        (("kind", "(3, 2)"), ("symbol", "H1")),
+        (("True", "x"),),
+        (("1", "x"),),
+    ]
@@ -0,0 +1,32 @@
+"""Test that incremental cluster updates after tumbles match full cluster searches."""
+
+import pytest
+
+from src.calculations.cluster import Cluster
+
+
+def set_incremental(incremental):
+    def setup(config, gamestate):
+        config.incremental_clusters = incremental
+
+    return setup
+
+
+@pytest.mark.parametrize("betmode", ["base", "bonus"])
+def test_incremental_clusters(betmode, monkeypatch, run_books):
+    "Every incremental update equals a full search of the tumbled board, and books are unchanged."
+    update_clusters = Cluster.update_clusters
+    updates = []
+
+    def checked_update(board, clusters, changed_positions, wild_key="wild"):
+        updated = update_clusters(board, clusters, changed_positions, wild_key)
+        assert updated == Cluster.get_clusters(board, wild_key)
+        assert list(updated) == list(Cluster.get_clusters(board, wild_key))
+        updates.append(len(changed_positions))
+        return updated
+
+    num_sims = 200 if betmode == "base" else 20
+    books = run_books("0_0_cluster", betmode, num_sims, set_incremental(False))
+    monkeypatch.setattr(Cluster, "update_clusters", checked_update)
+    assert run_books("0_0_cluster", betmode, num_sims, set_incremental(True)) == books
+    assert len(updates) > 0
@@ -0,0 +1,130 @@
+"""Test concatenation, hashing and payout sidecars used to write the final output files."""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import random
+
+import pytest
+import zstandard as zstd
+
+from src.write_data import write_data
+from src.write_data.write_data import (
+    combine_book_files,
+    combine_payout_files,
+    concatenate_files,
+    get_book_compressor,
+    get_payout_hash,
+    get_payout_sidecar_name,
+    get_sha_256,
+    make_compressor,
+    write_payout_sidecar,
+)
+
+
+def write_chunks(tmp_path, suffix, chunks):
+    names = []
+    for index, chunk in enumerate(chunks):
+        name = str(tmp_path / f"chunk_{index}{suffix}")
+        with open(name, "wb") as f:
+            f.write(chunk)
+        names.append(name)
+    return names
+
+
+@pytest.mark.parametrize("zero_copy", [True, False])
+def test_concatenate_files(tmp_path, monkeypatch, zero_copy):
+    "Files are concatenated byte for byte, with and without kernel copies."
+    if not zero_copy:
+        monkeypatch.setattr(write_data, "copy_file_range", lambda in_fd, out_fd, count: False)
+    rng = random.Random(0)
+    chunks = [b"1,1,0\n2,1,150\n", b"", rng.randbytes(3 * write_data.COPY_CHUNK_SIZE + 5), b"\r\n"]
+    out_name = str(tmp_path / "out.csv")
+    concatenate_files(write_chunks(tmp_path, ".csv", chunks), out_name)
+    with open(out_name, "rb") as f:
+        assert f.read() == b"".join(chunks)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".json", ".jsonl.zst"])
+def test_combine_book_files_hash(tmp_path, suffix):
+    "The hash computed while combining books equals the hash of the written books file."
+    books = [[b'{"id": 1}', b'{"id": 2}'], [b'{"id": 3}'], [b'{"id": 4}', b'{"id": 5}']]
+    if suffix == ".json":
+        chunks = [b"[" + b", ".join(chunk) + b"]" for chunk in books]
+    else:
+        chunks = [b"\n".join(chunk) + b"\n" for chunk in books]
+    if suffix.endswith(".zst"):
+        chunks = [zstd.ZstdCompressor().compress(chunk) for chunk in chunks]
+    out_name = str(tmp_path / f"books{suffix}")
+    hasher = hashlib.sha256()
+    combine_book_files(write_chunks(tmp_path, suffix, chunks), out_name, suffix.endswith(".zst"), hasher)
+    assert hasher.hexdigest() == get_sha_256(out_name)
+    with open(out_name, "rb") as f:
+        data = f.read()
+    if suffix.endswith(".zst"):
+        data = zstd.ZstdDecompressor().stream_reader(data).read()
+    if suffix == ".json":
+        assert data == json.dumps([json.loads(book) for chunk in books for book in chunk]).encode("UTF-8")
+    else:
+        assert data == b"".join(b"\n".join(chunk) + b"\n" for chunk in books)
+
+
+def test_payout_sidecars(tmp_path):
+    "Packed payout sidecars merge in order and hash as the pickled list of integers."
+    payouts = [[0, 150, 2500000], [], [12, 0]]
+    book_names = [str(tmp_path / f"books_{index}.jsonl.zst") for index in range(len(payouts))]
+    for book_name, chunk in zip(book_names, payouts):
+        write_payout_sidecar(book_name, chunk)
+    sidecars = [get_payout_sidecar_name(name) for name in book_names] + [str(tmp_path / "missing.payouts")]
+    merged = combine_payout_files(sidecars)
+    assert merged.tolist() == [0, 150, 2500000, 12, 0]
+    assert get_payout_hash(merged) == hashlib.md5(pickle.dumps([0, 150, 2500000, 12, 0])).hexdigest()
+    assert os.path.getsize(sidecars[0]) == 3 * write_data.PAYOUT_DTYPE.itemsize
+
+
+@pytest.mark.parametrize("long_distance", [False, True])
+def test_combine_book_frames(tmp_path, long_distance):
+    "Concatenated zstd frames decompress to the same books as a recompressed file."
+    rng = random.Random(0)
+    books = [
+        b"".join(b'{"id": %d, "events": [%d]}\n' % (i, rng.randint(0, 9)) for i in range(j, j + 500)) for j in (1, 501)
+    ]
+    compressor = make_compressor(level=5, long_distance=long_distance)
+    book_files = write_chunks(tmp_path, ".jsonl.zst", [compressor.compress(chunk) for chunk in books] + [b""])
+    frames, recompressed = str(tmp_path / "frames.jsonl.zst"), str(tmp_path / "recompressed.jsonl.zst")
+    hasher = hashlib.sha256()
+    combine_book_files(book_files, frames, True, hasher, merge="frames")
+    combine_book_files(book_files, recompressed, True, merge="recompress", compressor=compressor)
+    assert hasher.hexdigest() == get_sha_256(frames)
+    for name in (frames, recompressed):
+        with open(name, "rb") as f, zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+            assert reader.read() == b"".join(books)
+
+
+def test_compressor_threads():
+    "Multithreaded zstd output does not depend on the number of workers, single threaded output is unchanged."
+    data = b"".join(b'{"id": %d, "payoutMultiplier": %d}\n' % (i, i % 7) for i in range(200000))
+    outputs = set()
+    for threads in (1, 2, -1):
+        buffer = io.BytesIO()
+        with make_compressor(threads=threads).stream_writer(buffer, closefd=False) as writer:
+            writer.write(data)
+        outputs.add(buffer.getvalue())
+    assert len(outputs) == 1
+    assert zstd.ZstdDecompressor().decompress(outputs.pop(), max_output_size=len(data)) == data
+    assert make_compressor().compress(data) == zstd.ZstdCompressor().compress(data)
+
+
+def test_book_merge_option():
+    "Unknown book_merge values are rejected."
+
+    class Config:
+        book_merge = "tar"
+        compression_level = 3
+        compression_threads = 0
+        compression_long_distance = False
+
+    with pytest.raises(ValueError):
+        get_book_compressor(Config())
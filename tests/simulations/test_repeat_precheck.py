@@ -0,0 +1,50 @@
+"""Test that pre-checked repeats leave books unchanged and repeat statistics are collected per criteria."""
+
+import pytest
+
+from src.state.run_sims import merge_repeat_stats, print_repeat_stats
+from utils.game_loader import load_game
+
+
+def set_precheck(precheck, rejected):
+    def setup(config, gamestate):
+        if precheck:
+            precheck_repeat = gamestate.precheck_repeat
+
+            def counted_precheck():
+                rejected.append(precheck_repeat())
+                return rejected[-1]
+
+            gamestate.precheck_repeat = counted_precheck
+        else:
+            gamestate.precheck_repeat = lambda: False
+
+    return setup
+
+
+@pytest.mark.parametrize("betmode", ["base", "bonus"])
+def test_precheck_books_unchanged(betmode, run_books):
+    "Attempts rejected by precheck_repeat() give the same books as full attempts."
+    rejected = []
+    books = run_books("0_0_lines", betmode, 300, set_precheck(False, rejected))
+    assert run_books("0_0_lines", betmode, 300, set_precheck(True, rejected)) == books
+    if betmode == "base":
+        assert sum(rejected) > 0
+
+
+def test_repeat_stats(capsys):
+    "Repeat statistics of a gamestate are summed per criteria."
+    _, gamestate = load_game("0_0_lines")
+    gamestate.criteria = "0"
+    gamestate.repeat_count, gamestate.precheck_count = 3, 2
+    gamestate.update_repeat_stats(0.5)
+    gamestate.repeat_count, gamestate.precheck_count = 0, 0
+    gamestate.update_repeat_stats(0.25)
+    assert gamestate.repeat_stats == {"0": {"sims": 2, "attempts": 4, "prechecked": 2, "seconds": 0.75}}
+
+    totals = {}
+    merge_repeat_stats(totals, gamestate.repeat_stats)
+    merge_repeat_stats(totals, {"0": {"sims": 1, "attempts": 1, "prechecked": 0, "seconds": 0.25}})
+    assert totals == {"0": {"sims": 3, "attempts": 5, "prechecked": 2, "seconds": 1.0}}
+    print_repeat_stats("base", totals)
+    assert "attempts/sim      1.67" in capsys.readouterr().out
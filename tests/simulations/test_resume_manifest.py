@@ -0,0 +1,78 @@
+"""Test the temp-file manifest used to resume interrupted simulations."""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.state.run_sims import get_completed_chunks, get_run_fingerprint, record_completed_chunk
+
+
+class TempFilesTest:
+    """Temp filenames inside a pytest tmp_path."""
+
+    def __init__(self, temp_path):
+        self.temp_path = str(temp_path)
+
+    def get_temp_multi_thread_name(self, betmode, thread_index, repeat_count, compress):
+        return os.path.join(self.temp_path, f"books_{betmode}_{thread_index}_{repeat_count}.jsonl.zst")
+
+    def get_temp_lookup_name(self, betmode, thread_index, repeat_count):
+        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{thread_index}_{repeat_count}")
+
+    def get_temp_segmented_name(self, betmode, thread_index, repeat_count):
+        return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{thread_index}_{repeat_count}")
+
+    def get_temp_force_name(self, betmode, thread_index, repeat_count):
+        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+
+    def get_temp_manifest_name(self, betmode):
+        return os.path.join(self.temp_path, f"manifest_{betmode}.jsonl")
+
+
+def write_temp_files(output_files, betmode, chunk, repeat):
+    for f_name in [
+        output_files.get_temp_multi_thread_name(betmode, chunk, repeat, True),
+        output_files.get_temp_lookup_name(betmode, chunk, repeat),
+        output_files.get_temp_segmented_name(betmode, chunk, repeat),
+        output_files.get_temp_force_name(betmode, chunk, repeat),
+    ]:
+        open(f_name, "w", encoding="UTF-8").close()
+
+
+def test_completed_chunks_require_temp_files(tmp_path):
+    "Only chunks with all temp files present are treated as finished."
+    gamestate = SimpleNamespace(output_files=TempFilesTest(tmp_path))
+    write_temp_files(gamestate.output_files, "base", 0, 0)
+    record_completed_chunk(gamestate, "base", (0, 0, 0, 50), ("symbol", "kind"), "run")
+    record_completed_chunk(gamestate, "base", (1, 0, 50, 100), ("symbol",), "run")
+    with open(gamestate.output_files.get_temp_manifest_name("base"), "a", encoding="UTF-8") as f:
+        f.write('{"chunk": 2, "repe')  # interrupted while writing
+
+    completed = get_completed_chunks(gamestate, "base", True, "run")
+    assert completed == {(0, 0, 0, 50): ["kind", "symbol"]}
+
+
+def test_missing_manifest(tmp_path):
+    "Without a manifest nothing is resumed."
+    gamestate = SimpleNamespace(output_files=TempFilesTest(tmp_path))
+    assert get_completed_chunks(gamestate, "base", True, "run") == {}
+
+
+def test_other_run_fingerprint(tmp_path):
+    "Chunks recorded by a run with another fingerprint are not resumed."
+    gamestate = SimpleNamespace(output_files=TempFilesTest(tmp_path))
+    write_temp_files(gamestate.output_files, "base", 0, 0)
+    record_completed_chunk(gamestate, "base", (0, 0, 0, 50), ("symbol",), "run")
+    with pytest.warns(UserWarning, match="Ignoring 1 finished chunks"):
+        assert get_completed_chunks(gamestate, "base", True, "other run") == {}
+
+
+def test_run_fingerprint():
+    "The fingerprint changes with the settings, criteria and seeds of a run."
+    settings = {"num_sims": 100, "batch_size": 50, "shard": None}
+    fingerprint = get_run_fingerprint(settings, ["0", "basegame"], [0, 1])
+    assert get_run_fingerprint(dict(settings), ["0", "basegame"], [0, 1]) == fingerprint
+    assert get_run_fingerprint({**settings, "shard": [0, 2]}, ["0", "basegame"], [0, 1]) != fingerprint
+    assert get_run_fingerprint(settings, ["basegame", "0"], [0, 1]) != fingerprint
+    assert get_run_fingerprint(settings, ["0", "basegame"], [0, 2]) != fingerprint
@@ -0,0 +1,50 @@
+"""Test the gamestate random number generator backends."""
+
+import random
+import pytest
+
+from src.calculations.rng import NumpyRng, make_rng
+
+
+def use_backend(backend, disturb_global=False):
+    def setup(config, gamestate):
+        gamestate.rng = make_rng(backend)
+        if disturb_global:
+            run_spin = gamestate.run_spin
+
+            def disturbed_spin(sim, simulation_seed=None):
+                random.random()
+                return run_spin(sim, simulation_seed)
+
+            gamestate.run_spin = disturbed_spin
+
+    return setup
+
+
+@pytest.mark.parametrize("game_id", ["0_0_lines", "0_0_expwilds", "0_0_cluster"])
+def test_python_backend_matches_global(game_id, run_books):
+    "The per-gamestate random.Random gives the global random books and ignores global random draws."
+    books = run_books(game_id, "base", 100, use_backend("global"))
+    assert run_books(game_id, "base", 100, use_backend("python", disturb_global=True)) == books
+
+
+def test_numpy_backend_reproducible(run_books):
+    "The NumPy backend gives the same books for the same simulation seeds."
+    books = run_books("0_0_lines", "base", 100, use_backend("numpy"))
+    assert run_books("0_0_lines", "base", 100, use_backend("numpy")) == books
+    assert books != run_books("0_0_lines", "base", 100, use_backend("global"))
+
+
+def test_numpy_draws():
+    "NumPy backend draws are python scalars within the requested ranges."
+    rng = NumpyRng()
+    rng.seed(1)
+    stops = rng.randrange_array([5, 1, 200])
+    assert all(isinstance(stop, int) and 0 <= stop < size for stop, size in zip(stops, [5, 1, 200]))
+    assert {rng.randint(0, 2) for _ in range(200)} == {0, 1, 2}
+    assert rng.choices(["a", "b"], [0, 1], k=3) == ["b", "b", "b"]
+    values = list(range(10))
+    rng.shuffle(values)
+    assert sorted(values) == list(range(10))
+    rng.seed(1)
+    assert rng.randrange_array([5, 1, 200]) == stops
@@ -0,0 +1,36 @@
+"""Test splitting of simulations into scheduler chunks."""
+
+from src.state.run_sims import get_sim_chunks, get_shard_chunks
+
+
+def test_single_chunk_matches_thread_batches():
+    "One chunk per thread reproduces the (thread, repeat) batch layout."
+    threads, batch, num_sims = 4, 50, 400
+    sims_per_thread = 50
+    expected = []
+    for repeat in range(2):
+        for thread in range(threads):
+            start = thread * sims_per_thread + threads * sims_per_thread * repeat
+            expected.append((thread, repeat, start, start + sims_per_thread))
+
+    assert get_sim_chunks(threads, batch, num_sims) == expected
+
+
+def test_chunks_cover_all_sims_in_order():
+    "Uneven chunk sizes still cover every simulation exactly once, in order."
+    sim_chunks = get_sim_chunks(4, 50, 400, chunks_per_thread=7)
+    assert sim_chunks[0][2] == 0
+    assert sim_chunks[-1][3] == 400
+    for prev, nxt in zip(sim_chunks, sim_chunks[1:]):
+        assert prev[3] == nxt[2]
+    assert len(set((c[0], c[1]) for c in sim_chunks)) == len(sim_chunks)
+
+
+def test_shard_chunks_cover_all_sims():
+    "Shards split the covered simulations into contiguous, non-overlapping ranges."
+    sim_chunks = get_sim_chunks(threads=2, batching_size=100, num_sims=400, chunks_per_thread=3)
+    covered = []
+    for shard_index in range(3):
+        shard_chunks = get_shard_chunks(sim_chunks, shard_index, 3)
+        covered.extend(sim for _, _, start, end in shard_chunks for sim in range(start, end))
+    assert covered == list(range(400))
@@ -0,0 +1,115 @@
+"""Test that batched lines and ways evaluation matches the single board evaluators."""
+
+import random
+import numpy as np
+import pytest
+from src.calculations.lines import Lines
+from src.calculations.ways import Ways
+from tests.win_calculations.test_linespay import create_test_lines_gamestate
+from tests.win_calculations.test_wayspay import create_test_ways_gamestate
+
+
+def random_batch(gamestate, names, num_boards, seed=0):
+    """Random boards of Symbols with random multiplier values, and their symbol id and multiplier arrays."""
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(num_boards):
+        board = [
+            [gamestate.create_symbol(rng.choice(names)) for _ in range(rows)] for rows in gamestate.config.num_rows
+        ]
+        for reel in board:
+            for sym in reel:
+                if sym.check_attribute("multiplier"):
+                    sym.assign_attribute({"multiplier": rng.choice([1, 2, 3, 5])})
+        boards.append(board)
+    symbol_ids = np.array([[[gamestate.symbol_table_index[sym.name] for sym in reel] for reel in b] for b in boards])
+    multipliers = np.array(
+        [[[sym.multiplier if sym.check_attribute("multiplier") else 0 for sym in reel] for reel in b] for b in boards]
+    )
+    return boards, symbol_ids, multipliers
+
+
+@pytest.mark.parametrize("method", ["symbol", "global", "combined"])
+def test_lines_batch(method):
+    "Lines.get_lines_batch matches Lines.get_lines per board and per line."
+    gamestate = create_test_lines_gamestate()
+    symbol_names = list(gamestate.symbol_table_index)
+    boards, symbol_ids, multipliers = random_batch(gamestate, ["W", "WM", "H1", "H1", "H1", "X", "S"], 300)
+    global_mults = np.arange(len(boards)) % 4 + 1
+    batch = Lines.get_lines_batch(
+        symbol_ids,
+        gamestate.config,
+        symbol_names,
+        multipliers=multipliers,
+        multiplier_method=method,
+        global_multiplier=global_mults,
+    )
+    line_numbers = {line_index: number for number, line_index in enumerate(gamestate.config.paylines)}
+    for index, board in enumerate(boards):
+        expected = Lines.get_lines(
+            board, gamestate.config, multiplier_method=method, global_multiplier=int(global_mults[index])
+        )
+        assert batch["totalWin"][index] == pytest.approx(expected["totalWin"])
+        assert np.count_nonzero(batch["wins"][index]) == len(expected["wins"])
+        for win in expected["wins"]:
+            number = line_numbers[win["meta"]["lineIndex"]]
+            assert batch["wins"][index, number] == pytest.approx(win["win"])
+            assert symbol_names[batch["symbols"][index, number]] == win["symbol"]
+            assert batch["kinds"][index, number] == win["kind"]
+
+
+@pytest.mark.parametrize("strategy", ["symbol", "board", "global"])
+def test_ways_batch(strategy):
+    "Ways.get_ways_batch matches Ways.get_ways_data per board and per symbol."
+    gamestate = create_test_ways_gamestate()
+    gamestate.config.special_symbols["multiplier"] = ["W"]
+    gamestate.create_symbol_map()
+    symbol_names = list(gamestate.symbol_table_index)
+    boards, symbol_ids, multipliers = random_batch(gamestate, ["W", "H1", "H1", "H2", "H2", "X"], 300)
+    batch = Ways.get_ways_batch(
+        symbol_ids,
+        gamestate.config,
+        symbol_names,
+        multipliers=multipliers,
+        multiplier_strategy=strategy,
+        global_multiplier=3,
+    )
+    for index, board in enumerate(boards):
+        expected = Ways.get_ways_data(gamestate.config, board, global_multiplier=3, multiplier_strategy=strategy)
+        assert batch["totalWin"][index] == pytest.approx(expected["totalWin"])
+        assert np.count_nonzero(batch["wins"][index]) == len(expected["wins"])
+        for win in expected["wins"]:
+            symbol_id = gamestate.symbol_table_index[win["symbol"]]
+            assert batch["wins"][index, symbol_id] == pytest.approx(win["win"])
+            assert batch["kinds"][index, symbol_id] == win["kind"]
+            assert batch["ways"][index, symbol_id] == win["meta"]["ways"]
+
+
+def test_batch_replaced_tables():
+    "Batch lines and ways totals follow config.paytable and config.paylines when they are replaced."
+    gamestate = create_test_lines_gamestate()
+    config = gamestate.config
+    symbol_names = list(gamestate.symbol_table_index)
+    boards, symbol_ids, _ = random_batch(gamestate, ["W", "H1", "H1", "H1", "X"], 100)
+    paylines = list(config.paylines.values())
+    replacements = [
+        ("paytable", {key: 2 * payout for key, payout in config.paytable.items()}),
+        ("paylines", {10 + index: line for index, line in enumerate(reversed(paylines[1:]))}),
+        ("paytable", {key: 0 for key in config.paytable}),
+    ]
+    for name, table in [(None, None)] + replacements:
+        if name is not None:
+            setattr(config, name, table)
+        batch = Lines.get_lines_batch(symbol_ids, config, symbol_names)
+        expected = [Lines.get_lines(board, config)["totalWin"] for board in boards]
+        assert batch["totalWin"] == pytest.approx(expected)
+
+    gamestate = create_test_ways_gamestate()
+    config = gamestate.config
+    symbol_names = list(gamestate.symbol_table_index)
+    boards, symbol_ids, _ = random_batch(gamestate, ["W", "H1", "H1", "H2", "H2", "X"], 100)
+    for paytable in [config.paytable, {key: 2 * payout for key, payout in config.paytable.items()}]:
+        config.paytable = paytable
+        batch = Ways.get_ways_batch(symbol_ids, config, symbol_names)
+        expected = [Ways.get_ways_data(config, board)["totalWin"] for board in boards]
+        assert batch["totalWin"] == pytest.approx(expected)
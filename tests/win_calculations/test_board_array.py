@@ -0,0 +1,100 @@
+"""Test that the BoardArray evaluators match the Symbol board evaluators."""
+
+import random
+import pytest
+from src.calculations.board_array import BoardArray
+from src.calculations.lines import Lines
+from src.calculations.ways import Ways
+from src.calculations.scatter import Scatter
+from src.calculations.cluster import Cluster
+from tests.win_calculations.test_linespay import create_test_lines_gamestate
+from tests.win_calculations.test_wayspay import create_test_ways_gamestate
+from tests.win_calculations.test_scatterpay import create_test_scatter_gamestate
+from tests.win_calculations.test_clusterpay import create_test_cluster_gamestate
+
+
+def random_boards(gamestate, names, num_boards, seed=0):
+    """Pairs of identical random boards, symbols with a multiplier attribute get random values."""
+    rng = random.Random(seed)
+    for _ in range(num_boards):
+        grid = [[rng.choice(names) for _ in range(rows)] for rows in gamestate.config.num_rows]
+        mults = [[rng.choice([1, 2, 3, 5]) for _ in reel] for reel in grid]
+        boards = []
+        for _ in range(2):
+            board = [[gamestate.create_symbol(name) for name in reel] for reel in grid]
+            for reel, _ in enumerate(board):
+                for row, sym in enumerate(board[reel]):
+                    if sym.check_attribute("multiplier"):
+                        sym.assign_attribute({"multiplier": mults[reel][row]})
+            boards.append(board)
+        yield boards
+
+
+def test_lines_array():
+    "Lines.get_lines_array matches Lines.get_lines."
+    gamestate = create_test_lines_gamestate()
+    names = ["W", "WM", "H1", "H1", "H1", "X", "S"]
+    for board, board_copy in random_boards(gamestate, names, 300):
+        board_array = BoardArray(board_copy, gamestate.symbol_table_index)
+        for method in ["symbol", "global", "combined"]:
+            expected = Lines.get_lines(board, gamestate.config, multiplier_method=method, global_multiplier=2)
+            actual = Lines.get_lines_array(
+                board_copy, board_array, gamestate.config, multiplier_method=method, global_multiplier=2
+            )
+            assert actual == expected
+
+
+def test_lines_array_replaced_tables():
+    "Lines.get_lines_array matches Lines.get_lines after config.paytable and config.paylines are replaced."
+    gamestate = create_test_lines_gamestate()
+    config = gamestate.config
+    names = ["W", "WM", "H1", "H1", "H1", "X", "S"]
+    paylines = list(config.paylines.values())
+    replacements = [
+        ("paytable", {**{key: 2 * payout for key, payout in config.paytable.items()}, (2, "H1"): 5, (2, "W"): 7}),
+        ("paylines", {10 + index: line for index, line in enumerate(reversed(paylines[1:]))}),
+        ("paytable", {key: 0 for key in config.paytable}),
+    ]
+    for seed, (name, table) in enumerate([(None, None)] + replacements):
+        if name is not None:
+            setattr(config, name, table)
+        for board, board_copy in random_boards(gamestate, names, 100, seed):
+            board_array = BoardArray(board_copy, gamestate.symbol_table_index)
+            assert Lines.get_lines_array(board_copy, board_array, config) == Lines.get_lines(board, config)
+
+
+@pytest.mark.parametrize("strategy", ["symbol", "board", "global"])
+def test_ways_array(strategy):
+    "Ways.get_ways_data_array matches Ways.get_ways_data for every multiplier strategy."
+    gamestate = create_test_ways_gamestate()
+    gamestate.config.special_symbols["multiplier"] = ["W"]
+    gamestate.create_symbol_map()
+    names = ["W", "H1", "H1", "H2", "H2", "X"]
+    for board, board_copy in random_boards(gamestate, names, 300):
+        board_array = BoardArray(board_copy, gamestate.symbol_table_index)
+        expected = Ways.get_ways_data(gamestate.config, board, global_multiplier=3, multiplier_strategy=strategy)
+        actual = Ways.get_ways_data_array(
+            gamestate.config, board_copy, board_array, global_multiplier=3, multiplier_strategy=strategy
+        )
+        assert actual == expected
+
+
+def test_scatter_array():
+    "Scatter.get_scatterpay_wins_array matches Scatter.get_scatterpay_wins, including exploded symbols."
+    gamestate = create_test_scatter_gamestate()
+    names = ["W", "WM", "H1", "H1", "H1", "H2", "H2", "M"]
+    for board, board_copy in random_boards(gamestate, names, 300):
+        board_array = BoardArray(board_copy, gamestate.symbol_table_index)
+        expected = Scatter.get_scatterpay_wins(gamestate.config, board, global_multiplier=2)
+        actual = Scatter.get_scatterpay_wins_array(gamestate.config, board_copy, board_array, global_multiplier=2)
+        assert actual == expected
+        assert [[s.explode for s in reel] for reel in board_copy] == [[s.explode for s in reel] for reel in board]
+
+
+def test_clusters_array():
+    "Cluster.get_clusters_array finds the same clusters, with positions in the same order."
+    gamestate = create_test_cluster_gamestate()
+    names = ["WM", "H1", "H1", "H1", "H2", "H2", "X"]
+    for board, _ in random_boards(gamestate, names, 300):
+        board_array = BoardArray(board, gamestate.symbol_table_index)
+        assert Cluster.get_clusters_array(board_array) == Cluster.get_clusters(board)
@@ -1,5 +1,6 @@
 """Test basic cluster-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.cluster import Cluster
@@ -99,3 +100,79 @@ def test_basic_cluster(gamestate):
         clusters=clusters,
     )
     assert total_win == gamestate.config.paytable[(9, "H1")]
+
+
+def test_pooled_cluster_explodes_copies(gamestate):
+    gamestate.symbol_storage.pool_symbols(gamestate.special_symbol_functions)
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            if idx < 3 and idy < 3:
+                gamestate.board[idx][idy] = gamestate.create_symbol("H1")
+            else:
+                gamestate.board[idx][idy] = gamestate.create_symbol("X")
+    pooled_h1 = gamestate.symbol_storage.pool["H1"]
+    assert gamestate.board[0][0] is pooled_h1
+
+    clusters = Cluster.get_clusters(gamestate.board)
+    board, _, total_win = Cluster.evaluate_clusters(
+        config=gamestate.config,
+        board=gamestate.board,
+        clusters=clusters,
+    )
+    assert total_win == gamestate.config.paytable[(9, "H1")]
+    assert all(board[idx][idy].explode and board[idx][idy] is not pooled_h1 for idx in range(3) for idy in range(3))
+    assert not pooled_h1.explode and gamestate.create_symbol("H1") is pooled_h1
+
+
+def test_pooled_symbols_are_read_only(gamestate):
+    gamestate.symbol_storage.pool_symbols(gamestate.special_symbol_functions)
+    assert "WM" not in gamestate.symbol_storage.pool
+    with pytest.raises(RuntimeError):
+        gamestate.create_symbol("H2").assign_attribute({"multiplier": 2})
+    copied = gamestate.create_symbol("H2").copy()
+    copied.assign_attribute({"multiplier": 2})
+    assert copied.name == "H2" and copied.multiplier == 2 and gamestate.create_symbol("H2").multiplier is None
+
+
+def recursive_clusters(board, wild_key="wild"):
+    """Reference recursive neighbour search, as used before the iterative flood fill."""
+
+    def check_all_neighbours(already_checked, local_checked, potential_cluster, reel, row, og_symbol):
+        neighbours = Cluster.get_neighbours(board, reel, row, local_checked)
+        for reel_, row_ in neighbours:
+            if Cluster.in_cluster(board, reel_, row_, og_symbol, wild_key):
+                potential_cluster += [(reel_, row_)]
+                already_checked += [(reel_, row_)]
+                check_all_neighbours(already_checked, local_checked, potential_cluster, reel_, row_, og_symbol)
+
+    already_checked, clusters = [], {}
+    for reel, _ in enumerate(board):
+        for row, _ in enumerate(board[reel]):
+            if (reel, row) not in already_checked and not board[reel][row].check_attribute(wild_key):
+                potential_cluster = [(reel, row)]
+                already_checked += [(reel, row)]
+                check_all_neighbours(
+                    already_checked, [(reel, row)], potential_cluster, reel, row, board[reel][row].name
+                )
+                clusters.setdefault(board[reel][row].name, []).append(potential_cluster)
+    return clusters
+
+
+@pytest.mark.parametrize("num_reels,num_rows", [(6, 6), (8, 8), (7, 9)])
+def test_clusters_match_recursive_search(gamestate, num_reels, num_rows):
+    "Iterative cluster detection finds the same clusters in the same position order, sharing wilds."
+    rng = random.Random(num_reels * num_rows)
+    for _ in range(200):
+        board = [
+            [gamestate.create_symbol(rng.choice(["H1", "H1", "H2", "H2", "WM", "X"])) for _ in range(num_rows)]
+            for _ in range(num_reels)
+        ]
+        assert Cluster.get_clusters(board) == recursive_clusters(board)
+
+
+def test_large_board_cluster(gamestate):
+    "Clusters larger than the recursion limit are found without recursion."
+    board = [[gamestate.create_symbol("H1") for _ in range(60)] for _ in range(60)]
+    board[30][30] = gamestate.create_symbol("WM")
+    clusters = Cluster.get_clusters(board)
+    assert len(clusters["H1"]) == 1 and len(clusters["H1"][0]) == 60 * 60
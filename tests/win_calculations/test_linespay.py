@@ -122,3 +122,36 @@ def test_linespay_mult(gamestate):
 
     windata = Lines.get_lines(gamestate.board, gamestate.config)
     assert windata["totalWin"] == (gamestate.config.paytable[(5, "WM")] * sum([3, 3, 3, 3, 3]))
+
+
+def test_linespay_short_kinds(gamestate):
+    "Lines are not skipped when the paytable has 1-kind pays."
+    gamestate.config.paytable[(1, "H1")] = 1
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            gamestate.board[idx][idy] = gamestate.create_symbol("X")
+    gamestate.board[0][0] = gamestate.create_symbol("H1")
+
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    # paylines 1 and 2 start on row 0
+    assert windata["totalWin"] == 2
+    assert all(win["kind"] == 1 and win["positions"] == [{"reel": 0, "row": 0}] for win in windata["wins"])
+
+
+def test_linespay_replaced_tables(gamestate):
+    "Replacing config.paytable or config.paylines after a win evaluation recompiles the lines."
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            gamestate.board[idx][idy] = gamestate.create_symbol("H1")
+    num_lines = len(gamestate.config.paylines)
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    assert windata["totalWin"] == gamestate.config.paytable[(5, "H1")] * num_lines
+
+    gamestate.config.paytable = {**gamestate.config.paytable, (5, "H1"): 1000}
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    assert windata["totalWin"] == 1000 * num_lines
+
+    gamestate.config.paylines = {1: gamestate.config.paylines[1]}
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    assert windata["totalWin"] == 1000
+    assert [win["meta"]["lineIndex"] for win in windata["wins"]] == [1]
@@ -0,0 +1,67 @@
+"""Test that cached weight tables draw the same outcomes as plain distribution dicts."""
+
+import random
+import pytest
+from src.calculations.statistics import WeightTable, get_random_outcome, make_weight_tables
+from src.config.distributions import Distribution
+
+DISTRIBUTIONS = [
+    {"BR0": 1},
+    {2: 100, 3: 80, 5: 60, 10: 20, 50: 1},
+    {1: 0, 2: 0.5, 3: 0, 4: 1.25, 5: 0.1, 6: 0},
+    {value: (value * 7) % 13 for value in range(40)},
+]
+
+
+@pytest.mark.parametrize("weights", DISTRIBUTIONS)
+def test_weight_table_sequence(weights):
+    "WeightTable draws reproduce the plain dict draws and random stream for the same seed."
+    random.seed(42)
+    expected = [get_random_outcome(weights) for _ in range(2000)]
+    expected_state = random.getstate()
+    random.seed(42)
+    table = WeightTable(weights)
+    assert [get_random_outcome(table) for _ in range(2000)] == expected
+    assert random.getstate() == expected_state
+
+
+def test_weight_table_total_weight():
+    "An explicit total weight is used as the roll range, as for plain dicts."
+    weights = {1: 1, 2: 1}
+    random.seed(3)
+    expected = [repr(get_random_outcome(weights, totalWeight=4)) for _ in range(500)]
+    random.seed(3)
+    assert [repr(get_random_outcome(WeightTable(weights), totalWeight=4)) for _ in range(500)] == expected
+    assert "Exception('error drawing item from distribution')" in expected
+
+
+def test_weight_table_modified():
+    "Modifying a WeightTable rebuilds its sampler."
+    table = WeightTable({1: 1, 2: 0})
+    assert get_random_outcome(table) == 1
+    table[1] = 0
+    table[2] = 1
+    assert get_random_outcome(table) == 2
+    table.update({3: 5})
+    del table[2]
+    assert table.get_sampler().values == [1, 3]
+
+
+def test_distribution_weight_tables():
+    "Distribution conditions hold WeightTables for nested weight dicts only."
+    conditions = {
+        "reel_weights": {"basegame": {"BR0": 1}, "freegame": {"FR0": 1, "FR1": 2}},
+        "scatter_triggers": {4: 1, 5: 2},
+        "force_wincap": True,
+        "force_freegame": True,
+        "labels": {"a": "b"},
+    }
+    distribution = Distribution(criteria="wincap", quota=1, conditions=conditions)
+    distribution_conditions = distribution._conditions
+    assert isinstance(distribution_conditions["reel_weights"]["freegame"], WeightTable)
+    assert isinstance(distribution_conditions["scatter_triggers"], WeightTable)
+    assert not isinstance(distribution_conditions["reel_weights"], WeightTable)
+    assert not isinstance(distribution_conditions["labels"], WeightTable)
+    assert distribution_conditions["reel_weights"]["freegame"] == {"FR0": 1, "FR1": 2}
+    make_weight_tables(distribution_conditions)
+    assert distribution_conditions["scatter_triggers"] == {4: 1, 5: 2}
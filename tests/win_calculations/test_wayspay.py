@@ -1,7 +1,9 @@
 """Test basic ways-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
+from src.calculations.board_array import BoardArray
 from src.calculations.ways import Ways
 
 
@@ -136,3 +138,30 @@ def test_global_multiplier_strategy(gamestate):
     expected_win = base_win * global_mult
 
     assert windata["totalWin"] == expected_win, f"Expected {expected_win}, got {windata['totalWin']}"
+
+
+@pytest.mark.parametrize("strategy", ["symbol", "board", "global"])
+def test_ways_large_board(strategy):
+    "6 reel x 7 row boards give the same wins as the BoardArray evaluator."
+    gamestate = create_test_ways_gamestate()
+    gamestate.config.num_reels, gamestate.config.num_rows = 6, [7] * 6
+    gamestate.config.paytable.update({(6, "H1"): 80, (6, "H2"): 40})
+    gamestate.config.special_symbols["multiplier"] = ["W"]
+    gamestate.create_symbol_map()
+    rng = random.Random(7)
+    for _ in range(200):
+        board = [
+            [gamestate.create_symbol(rng.choice(["W", "H1", "H1", "H2", "H2", "X"])) for _ in range(7)]
+            for _ in range(6)
+        ]
+        for reel in board:
+            for sym in reel:
+                if sym.name == "W":
+                    sym.assign_attribute({"multiplier": rng.choice([1, 2, 3])})
+        board_array = BoardArray(board, gamestate.symbol_table_index)
+        expected = Ways.get_ways_data_array(
+            gamestate.config, board, board_array, global_multiplier=2, multiplier_strategy=strategy
+        )
+        assert (
+            Ways.get_ways_data(gamestate.config, board, global_multiplier=2, multiplier_strategy=strategy) == expected
+        )
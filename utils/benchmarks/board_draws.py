@@ -0,0 +1,50 @@
+"""Measure board draw throughput of create_board_reelstrips for each game, bet mode and game type.
+
+Usage: python -m utils.benchmarks.board_draws [-g 0_0_lines 0_0_cluster ...] [-n 20000] [-r 3]
+"""
+
+import time
+import argparse
+
+from utils.game_loader import get_game_ids, load_game
+
+
+def time_board_draws(gamestate: object, num_draws: int, repeats: int) -> float:
+    """Best time in seconds for num_draws board draws."""
+    best = float("inf")
+    for _ in range(repeats):
+        gamestate.reset_seed(0)
+        start = time.perf_counter()
+        for _ in range(num_draws):
+            gamestate.create_board_reelstrips()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_game(game_id: str, num_draws: int, repeats: int) -> None:
+    """Print boards/s for the first criteria of each bet mode, for every game type with reel weights."""
+    config, gamestate = load_game(game_id)
+    for bm in config.bet_modes:
+        distribution = bm.get_distributions()[0]
+        gamestate.betmode = bm.get_name()
+        gamestate.criteria = distribution.get_criteria()
+        gamestate.reset_book()
+        for gametype in gamestate.get_current_distribution_conditions()["reel_weights"]:
+            gamestate.gametype = gametype
+            elapsed = time_board_draws(gamestate, num_draws, repeats)
+            print(f"{game_id:<24} {bm.get_name():<10} {gametype:<10} {num_draws / elapsed:>10.0f} boards/s")
+
+
+def main():
+    """parse commandline arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", dest="games", nargs="+", default=None, help="Game ids, defaults to all games")
+    parser.add_argument("-n", dest="num_draws", type=int, default=20000, help="Board draws per game type")
+    parser.add_argument("-r", dest="repeats", type=int, default=3, help="Timing repeats, best is reported")
+    arguments = parser.parse_args()
+    for game_id in arguments.games or get_game_ids():
+        benchmark_game(game_id, arguments.num_draws, arguments.repeats)
+
+
+if __name__ == "__main__":
+    main()
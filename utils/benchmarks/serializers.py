@@ -0,0 +1,61 @@
+"""Compare book serialisation throughput of the available json serializers.
+
+Usage: python -m utils.benchmarks.serializers [-g 0_0_lines 0_0_cluster ...] [-n 200] [-r 5]
+"""
+
+import time
+import argparse
+
+from src.write_data.write_data import JSON_SERIALIZERS, get_json_serializer, dumps_json
+from utils.game_loader import get_game_ids, load_game, simulate_books
+
+
+def time_serializer(dumps, books: list, repeats: int) -> float:
+    """Best time in seconds to encode all books."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for book in books:
+            dumps(book)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_game(game_id: str, num_sims: int, repeats: int) -> None:
+    """Print books/s and MB/s for each serializer and bet mode of one game."""
+    config, gamestate = load_game(game_id)
+    serializers = []
+    for name in JSON_SERIALIZERS[1:]:
+        try:
+            serializers.append((name, get_json_serializer(name)))
+        except ImportError:
+            print(f"{name} not installed, skipping")
+    for bm in config.bet_modes:
+        books = simulate_books(gamestate, bm.get_name(), num_sims)
+        reference = [dumps_json(book) for book in books]
+        num_bytes = sum(len(data) for data in reference)
+        base_time = None
+        for name, dumps in serializers:
+            assert [dumps(book) for book in books] == reference, f"{name} output differs from json.dumps"
+            elapsed = time_serializer(dumps, books, repeats)
+            base_time = base_time or elapsed
+            print(
+                f"{game_id:<24} {bm.get_name():<10} {name:<8} "
+                f"{len(books) / elapsed:>10.0f} books/s {num_bytes / elapsed / 1e6:>8.1f} MB/s "
+                f"x{base_time / elapsed:.2f}"
+            )
+
+
+def main():
+    """parse commandline arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", dest="games", nargs="+", default=None, help="Game ids, defaults to all games")
+    parser.add_argument("-n", dest="num_sims", type=int, default=200, help="Simulations per bet mode")
+    parser.add_argument("-r", dest="repeats", type=int, default=5, help="Timing repeats, best is reported")
+    arguments = parser.parse_args()
+    for game_id in arguments.games or get_game_ids():
+        benchmark_game(game_id, arguments.num_sims, arguments.repeats)
+
+
+if __name__ == "__main__":
+    main()
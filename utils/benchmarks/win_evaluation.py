@@ -0,0 +1,99 @@
+"""Compare win evaluation throughput of the Symbol board evaluators, the BoardArray evaluators and batch evaluation.
+
+Usage: python -m utils.benchmarks.win_evaluation [-g 0_0_lines 0_0_cluster ...] [-n 5000] [-r 3]
+"""
+
+import time
+import argparse
+import numpy as np
+
+from src.calculations.board_array import BoardArray
+from src.calculations.lines import Lines
+from src.calculations.ways import Ways
+from src.calculations.scatter import Scatter
+from src.calculations.cluster import Cluster
+from utils.game_loader import get_game_ids, load_game
+
+EVALUATORS = {
+    "lines": (
+        lambda gs, board: Lines.get_lines(board, gs.config),
+        lambda gs, board, board_array: Lines.get_lines_array(board, board_array, gs.config),
+    ),
+    "ways": (
+        lambda gs, board: Ways.get_ways_data(gs.config, board),
+        lambda gs, board, board_array: Ways.get_ways_data_array(gs.config, board, board_array),
+    ),
+    "scatter": (
+        lambda gs, board: Scatter.get_scatterpay_wins(gs.config, board),
+        lambda gs, board, board_array: Scatter.get_scatterpay_wins_array(gs.config, board, board_array),
+    ),
+    "cluster": (
+        lambda gs, board: Cluster.get_clusters(board),
+        lambda gs, board, board_array: Cluster.get_clusters_array(board_array),
+    ),
+}
+
+BATCH_EVALUATORS = {
+    "lines": lambda gs, symbol_ids: Lines.get_lines_batch(symbol_ids, gs.config, list(gs.symbol_table_index)),
+    "ways": lambda gs, symbol_ids: Ways.get_ways_batch(symbol_ids, gs.config, list(gs.symbol_table_index)),
+}
+
+
+def best_time(function, repeats: int) -> float:
+    """Best time in seconds of repeated calls to function."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_game(game_id: str, num_boards: int, repeats: int) -> None:
+    """Print boards/s of each evaluator on basegame boards of the first bet mode."""
+    config, gamestate = load_game(game_id)
+    if config.win_type not in EVALUATORS:
+        print(f"{game_id:<24} no array evaluator for win type '{config.win_type}'")
+        return
+    evaluate, evaluate_array = EVALUATORS[config.win_type]
+    bm = config.bet_modes[0]
+    gamestate.betmode = bm.get_name()
+    gamestate.criteria = bm.get_distributions()[0].get_criteria()
+    gamestate.reset_book()
+    gamestate.reset_seed(0)
+    boards = []
+    for _ in range(num_boards):
+        gamestate.create_board_reelstrips()
+        boards.append(gamestate.board)
+
+    def run_objects():
+        for board in boards:
+            evaluate(gamestate, board)
+
+    def run_arrays():
+        for board in boards:
+            evaluate_array(gamestate, board, BoardArray(board, gamestate.symbol_table_index))
+
+    objects = num_boards / best_time(run_objects, repeats)
+    arrays = num_boards / best_time(run_arrays, repeats)
+    result = f"{game_id:<24} {config.win_type:<8} objects {objects:>9.0f} boards/s  arrays {arrays:>9.0f} boards/s"
+    if config.win_type in BATCH_EVALUATORS:
+        symbol_ids = np.stack([BoardArray(board, gamestate.symbol_table_index).symbol_ids for board in boards])
+        batch = num_boards / best_time(lambda: BATCH_EVALUATORS[config.win_type](gamestate, symbol_ids), repeats)
+        result += f"  batch {batch:>9.0f} boards/s"
+    print(result)
+
+
+def main():
+    """parse commandline arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", dest="games", nargs="+", default=None, help="Game ids, defaults to all games")
+    parser.add_argument("-n", dest="num_boards", type=int, default=5000, help="Boards evaluated per game")
+    parser.add_argument("-r", dest="repeats", type=int, default=3, help="Timing repeats, best is reported")
+    arguments = parser.parse_args()
+    for game_id in arguments.games or get_game_ids():
+        benchmark_game(game_id, arguments.num_boards, arguments.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Expand compact books (config.compact_books = True) back to the standard book format.
+
+Usage: python -m utils.decode_books -g 0_0_lines -m base [-o decoded_books_base.jsonl.zst]
+"""
+
+import io
+import os
+import json
+import argparse
+import zstandard as zstd
+
+from src.config.paths import PATH_TO_GAMES
+from src.write_data.write_data import BookWriter
+
+BOARD_KEYS = ("board", "newSymbols")
+
+
+def load_symbol_table(fe_config_path: str) -> list:
+    """Read the symbol table written to the frontend config of a compact run."""
+    with open(fe_config_path, "r", encoding="UTF-8") as f:
+        fe_config = json.load(f)
+    if "symbolTable" not in fe_config:
+        raise RuntimeError(f"{fe_config_path} has no symbolTable, books were not written in compact format")
+    return fe_config["symbolTable"]
+
+
+def decode_sym(cell, symbol_table: list):
+    """Expand a symbol index, or a symbol dict with an index as its name."""
+    if isinstance(cell, int):
+        return dict(symbol_table[cell])
+    if isinstance(cell["name"], int):
+        return {**cell, "name": symbol_table[cell["name"]]["name"]}
+    return cell
+
+
+def decode_book(book: dict, symbol_table: list) -> dict:
+    """Expand all board symbols of a book in place."""
+    for event in book["events"]:
+        for key in BOARD_KEYS:
+            if key in event:
+                event[key] = [[decode_sym(cell, symbol_table) for cell in reel] for reel in event[key]]
+    return book
+
+
+def read_books(filename: str):
+    """Yield books from a .jsonl.zst, .jsonl or .json books file."""
+    if filename.endswith(".json"):
+        with open(filename, "r", encoding="UTF-8") as f:
+            yield from json.load(f)
+        return
+    if filename.endswith(".zst"):
+        with open(filename, "rb") as f, zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+            for line in io.TextIOWrapper(reader, encoding="UTF-8"):
+                if line.strip():
+                    yield json.loads(line)
+        return
+    with open(filename, "r", encoding="UTF-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def decode_books_file(books_path: str, fe_config_path: str, output_path: str) -> int:
+    """Write the decoded books to output_path (format taken from its extension), returning the number of books."""
+    symbol_table = load_symbol_table(fe_config_path)
+    writer = BookWriter(output_path, output_regular_json=output_path.endswith(".json"), serializer="json")
+    for book in read_books(books_path):
+        writer.write(decode_book(book, symbol_table))
+    writer.close()
+    return writer.num_books
+
+
+def main():
+    """parse commandline arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", dest="game_id", required=True, help="Game id")
+    parser.add_argument("-m", dest="mode", required=True, help="Bet mode name")
+    parser.add_argument("-i", dest="input", default=None, help="Books file, defaults to the books written for the mode")
+    parser.add_argument("-o", dest="output", default=None, help="Output file, defaults to decoded_<input name>")
+    arguments = parser.parse_args()
+
+    library_path = os.path.join(PATH_TO_GAMES, arguments.game_id, "library")
+    books_path = arguments.input
+    if books_path is None:
+        candidates = [
+            os.path.join(library_path, "publish_files", f"books_{arguments.mode}.jsonl.zst"),
+            os.path.join(library_path, "books", f"books_{arguments.mode}.jsonl"),
+            os.path.join(library_path, "books", f"books_{arguments.mode}.json"),
+        ]
+        books_path = next((path for path in candidates if os.path.isfile(path)), candidates[0])
+    output_path = arguments.output or os.path.join(
+        os.path.dirname(books_path), "decoded_" + os.path.basename(books_path)
+    )
+    fe_config_path = os.path.join(library_path, "configs", f"config_fe_{arguments.game_id}.json")
+
+    num_books = decode_books_file(books_path, fe_config_path, output_path)
+    print(f"Decoded {num_books} books to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Load sample games and simulate books in memory, for benchmarks and tests."""
+
+import os
+import sys
+import importlib
+
+from src.config.paths import PATH_TO_GAMES
+from src.wins.win_manager import WinManager
+from src.state.run_sims import get_criteria_assignment
+
+GAME_MODULES = (
+    "game_config",
+    "gamestate",
+    "game_override",
+    "game_executables",
+    "game_calculations",
+    "game_events",
+    "game_optimization",
+)
+
+
+def get_game_ids() -> list:
+    """All game folders containing a game configuration, except the template."""
+    return sorted(
+        game_id
+        for game_id in os.listdir(PATH_TO_GAMES)
+        if game_id != "template"
+        and os.path.isfile(os.path.join(PATH_TO_GAMES, game_id, "game_config.py"))
+        and os.path.isfile(os.path.join(PATH_TO_GAMES, game_id, "gamestate.py"))
+    )
+
+
+def load_game(game_id: str) -> tuple:
+    """Import GameConfig and GameState from a game folder, returning (config, gamestate)."""
+    game_path = os.path.join(PATH_TO_GAMES, game_id)
+    for module_name in GAME_MODULES:
+        sys.modules.pop(module_name, None)  # game files import each other by bare module name
+    sys.path.insert(0, game_path)
+    try:
+        config = importlib.import_module("game_config").GameConfig()
+        gamestate = importlib.import_module("gamestate").GameState(config)
+    finally:
+        sys.path.remove(game_path)
+    return config, gamestate
+
+
+def simulate_books(gamestate: object, betmode: str, num_sims: int) -> list:
+    """Run num_sims simulations of a bet mode without writing files, returning the books."""
+    config = gamestate.config
+    config.wincap = gamestate.get_betmode(betmode).get_wincap()
+    gamestate.betmode = betmode
+    gamestate.win_manager = WinManager(config.basegame_type, config.freegame_type, config.wincap)
+    gamestate.library = {}
+    gamestate.recorded_events = {}
+    gamestate._payout_ints = []
+    set_sim_amount = any(d.get_fixed_amt() is not None for d in gamestate.get_betmode(betmode).get_distributions())
+    criteria_assignment, simulation_seeds = get_criteria_assignment(gamestate, betmode, num_sims, set_sim_amount)
+    for sim in range(num_sims):
+        gamestate.criteria = criteria_assignment[sim]
+        gamestate.run_spin(sim, simulation_seeds[sim])
+    return list(gamestate.library.values())